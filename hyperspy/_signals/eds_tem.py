@@ -693,8 +693,9 @@ def decomposition(self,
                 `output_dimension`: if the input data is larger than 500x500 and the
                 number of components to extract is lower than 80% of the smallest
                 dimension of the data, then the more efficient "randomized"
-                method is enabled. Otherwise the exact full SVD is computed and
-                optionally truncated afterwards.
+                method is enabled, using two power iterations if fewer than half of
+                the components are extracted. Otherwise the exact full SVD is
+                computed and optionally truncated afterwards.
             If full:
                 run exact SVD, calling the standard LAPACK solver via
                 :py:func:`scipy.linalg.svd`, and select the components by postprocessing
@@ -705,12 +706,24 @@ def decomposition(self,
             If randomized:
                 use truncated SVD, calling :py:func:`sklearn.utils.extmath.randomized_svd`
                 to estimate a limited number of components
-        copy : bool, default True
+        copy : bool or "disk", default True
             * If True, stores a copy of the data before any pre-treatments
               such as normalization in ``s._data_before_treatments``. The original
               data can then be restored by calling ``s.undo_treatments()``.
+              No copy is made if no pre-treatment is requested.
+            * If "disk", the copy is stored in a temporary memory-mapped
+              file instead of in memory, which is useful for data that
+              are too large to be copied in memory.
             * If False, no copy is made. This can be beneficial for memory
               usage, but care must be taken since data will be overwritten.
+        precision : {None, "single"}, default None
+            * If None, the decomposition is computed with the precision of
+              the data.
+            * If "single", the data is cast to single precision for the
+              decomposition, which is faster and uses less memory at the
+              expense of accuracy. The results are cast back to the
+              data type of the signal. Only supported by the "SVD"
+              algorithm.
         **kwargs : extra keyword arguments
             Any keyword arguments are passed to the decomposition algorithm.
 
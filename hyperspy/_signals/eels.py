@@ -156,16 +156,14 @@ def generate_subshells(self, include_pre_edges=False):
         end_energy = Eaxis[-1]
         for element in self.elements:
             e_shells = list()
-            for shell in elements_db[element][
-                    'Atomic_properties']['Binding_energies']:
+            for shell, shell_info in elements_db[element][
+                    'Atomic_properties']['Binding_energies'].items():
                 if shell[-1] != 'a':
-                    energy = (elements_db[element]['Atomic_properties']
-                              ['Binding_energies'][shell]['onset_energy (eV)'])
+                    energy = shell_info['onset_energy (eV)']
                     if start_energy <= energy <= end_energy:
                         subshell = '%s_%s' % (element, shell)
                         if subshell not in self.subshells:
-                            self.subshells.add(
-                                '%s_%s' % (element, shell))
+                            self.subshells.add(subshell)
                             e_shells.append(subshell)
 
     def edges_at_energy(self, energy='interactive', width=10, only_major=False,
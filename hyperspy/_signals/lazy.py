@@ -803,7 +803,9 @@ def decomposition(
             The decomposition algorithm to use.
         output_dimension : int or None, default None
             Number of components to keep/calculate. If None, keep all
-            (only valid for 'SVD' algorithm)
+            (only valid for 'SVD' algorithm). If not None, the 'SVD'
+            algorithm computes a randomized truncated SVD, which works for
+            any chunking of the data.
         get : dask scheduler
             the dask scheduler to use for computations;
             default `dask.threaded.get`
@@ -824,7 +826,12 @@ def decomposition(
             In the case of sklearn.decomposition objects, this includes the
             values of all arguments of the chosen sklearn algorithm.
         **kwargs
-            passed to the partial_fit/fit functions.
+            passed to the partial_fit/fit functions. For the 'SVD'
+            algorithm when ``output_dimension`` is not None, ``n_power_iter``
+            and ``compute`` are passed to
+            :py:func:`dask.array.linalg.svd_compressed`, and
+            ``random_state`` (int or RandomState, default 0) seeds it so
+            that the results are repeatable.
 
         References
         ----------
@@ -836,6 +843,7 @@ def decomposition(
         --------
         * :py:meth:`~.learn.mva.MVA.decomposition` for non-lazy signals
         * :py:func:`dask.array.linalg.svd`
+        * :py:func:`dask.array.linalg.svd_compressed`
         * :py:class:`sklearn.decomposition.IncrementalPCA`
         * :py:class:`~.learn.rpca.ORPCA`
         * :py:class:`~.learn.ornmf.ORNMF`
@@ -958,7 +966,7 @@ def decomposition(
             # LEARN
             if algorithm == "SVD":
                 reproject = False
-                from dask.array.linalg import svd
+                from dask.array.linalg import svd, svd_compressed
 
                 try:
                     self._unfolded4decomposition = self.unfold()
@@ -966,11 +974,24 @@ def decomposition(
                     if navigation_mask is not None or signal_mask is not None:
                         raise NotImplementedError("Masking is not yet implemented for lazy SVD")
 
-                    U, S, V = svd(self.data)
-
                     if output_dimension is None:
+                        U, S, V = svd(self.data)
                         min_shape = min(min(U.shape), min(V.shape))
                     else:
+                        # The randomized SVD only needs a few passes over
+                        # the data, which doesn't need to fit in memory
+                        svd_kwargs = {
+                            key: kwargs[key]
+                            for key in ("n_power_iter", "compute")
+                            if key in kwargs
+                        }
+                        svd_kwargs.setdefault("n_power_iter", 2)
+                        U, S, V = svd_compressed(
+                            self.data,
+                            k=output_dimension,
+                            seed=kwargs.get("random_state", 0),
+                            **svd_kwargs,
+                        )
                         min_shape = output_dimension
 
                     U = U[:, :min_shape]
@@ -1088,6 +1109,7 @@ def post(a):
         target.loadings = loadings
         target.explained_variance = explained_variance
         target.explained_variance_ratio = explained_variance_ratio
+        target._whitening_cache = None
 
         # Rescale the results if the noise was normalized
         if normalize_poissonian_noise is True:
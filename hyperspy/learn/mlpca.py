@@ -64,8 +64,9 @@ def mlpca(
             `output_dimension`: if the input data is larger than 500x500 and the
             number of components to extract is lower than 80% of the smallest
             dimension of the data, then the more efficient "randomized"
-            method is enabled. Otherwise the exact full SVD is computed and
-            optionally truncated afterwards.
+            method is enabled, using two power iterations if fewer than half of
+            the components are extracted. Otherwise the exact full SVD is
+            computed and optionally truncated afterwards.
         If full:
             run exact SVD, calling the standard LAPACK solver via
             :py:func:`scipy.linalg.svd`, and select the components by postprocessing
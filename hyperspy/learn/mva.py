@@ -17,13 +17,17 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import hashlib
 import logging
+import tempfile
 import types
 import warnings
 import dask.array as da
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import FuncFormatter, MaxNLocator
+from scipy import sparse
+from scipy.linalg import LinAlgWarning, lu_factor, lu_solve, solve_triangular
 
 import hyperspy.misc.io.tools as io_tools
 from hyperspy.exceptions import VisibleDeprecationWarning
@@ -33,8 +37,14 @@
 from hyperspy.learn.rpca import orpca, rpca_godec
 from hyperspy.learn.svd_pca import svd_pca
 from hyperspy.learn.whitening import whiten_data
+from hyperspy.misc.array_tools import (
+    numba_divide_rows_columns,
+    numba_nanminmax,
+    numba_row_column_sums,
+    numba_within_cluster_sums,
+)
 from hyperspy.misc.machine_learning import import_sklearn
-from hyperspy.misc.utils import ordinal, stack,is_hyperspy_signal
+from hyperspy.misc.utils import ordinal, is_hyperspy_signal
 from hyperspy.external.progressbar import progressbar
 
 try:
@@ -47,6 +57,64 @@
 _logger = logging.getLogger(__name__)
 
 
+# Deprecated names of the decomposition algorithms and their replacement
+_decomposition_algorithms_deprecated = {
+    "fast_svd": "SVD",
+    "svd": "SVD",
+    "fast_mlpca": "MLPCA",
+    "mlpca": "MLPCA",
+    "nmf": "NMF",
+    "RPCA_GoDec": "RPCA",
+}
+# Decomposition algorithms requiring output_dimension
+_decomposition_algorithms_require_dimension = (
+    "MLPCA",
+    "RPCA",
+    "ORPCA",
+    "ORNMF",
+)
+# Decomposition algorithms provided by scikit-learn
+_decomposition_algorithms_sklearn = (
+    "sklearn_pca",
+    "NMF",
+    "sparse_pca",
+    "mini_batch_sparse_pca",
+)
+
+# Default formatting of the signal and noise markers of the scree plot
+_scree_plot_signal_fmt = {
+    "c": "#C24D52",
+    "linestyle": "",
+    "marker": "^",
+    "markersize": 10,
+    "zorder": 3,
+}
+_scree_plot_noise_fmt = {
+    "c": "#4A70B0",
+    "linestyle": "",
+    "marker": "o",
+    "markersize": 10,
+    "zorder": 3,
+}
+
+# Keys of the results saved by old versions and their current name,
+# None for the keys which are not used any more
+_learning_results_legacy_keys = {
+    "algorithm": "decomposition_algorithm",
+    "V": "explained_variance",
+    "w": "unmixing_matrix",
+    "variance2one": None,
+    "centered": None,
+    "pca_algorithm": "decomposition_algorithm",
+    "ica_algorithm": "bss_algorithm",
+    "v": "loadings",
+    "scores": "loadings",
+    "pc": "loadings",
+    "ica_scores": "bss_loadings",
+    "ica_factors": "bss_factors",
+}
+
+
 if import_sklearn.sklearn_installed:
     decomposition_algorithms = {
         "sklearn_pca": import_sklearn.sklearn.decomposition.PCA,
@@ -71,25 +139,75 @@
 
 
 
-def _get_derivative(signal, diff_axes, diff_order):
-    """Calculate the derivative of a signal."""
+def _get_mask_derivative(mask, axis, order):
+    """Get the mask of the values of the derivative of a masked signal.
+
+    The returned mask is True where the derivative calculated by
+    :py:meth:`~hyperspy.signal.BaseSignal.derivative` depends on the
+    masked values, using the same finite differences as
+    :py:func:`numpy.gradient`.
+    """
+    axis = mask.axes_manager[axis]
+    # numpy.gradient only uses the central point for non-uniform spacing
+    spacing = np.diff(axis.axis)
+    uniform = (spacing == spacing[0]).all()
+    data = np.moveaxis(mask.data.astype(bool), axis.index_in_array, 0)
+    for _ in range(order):
+        dilated = np.empty_like(data)
+        dilated[1:-1] = data[:-2] | data[2:]
+        if not uniform:
+            dilated[1:-1] |= data[1:-1]
+        dilated[0] = data[0] | data[1]
+        dilated[-1] = data[-1] | data[-2]
+        data = dilated
+    return mask._deepcopy_with_new_data(
+        np.moveaxis(data, 0, axis.index_in_array)
+    )
+
+
+def _get_derivative(signal, diff_axes, diff_order, is_mask=False):
+    """Calculate the derivative of a signal.
+
+    If ``is_mask`` is True, ``signal`` is a boolean mask and the mask of
+    the derivative is returned instead, see :py:func:`_get_mask_derivative`.
+    """
+    if is_mask:
+
+        def derivative(order, axis):
+            return _get_mask_derivative(signal, axis=axis, order=order)
+
+    else:
+        derivative = signal.derivative
+
     if signal.axes_manager.signal_dimension == 1:
-        signal = signal.derivative(order=diff_order, axis=-1)
+        signal = derivative(order=diff_order, axis=-1)
     else:
         # n-d signal case.
         # Compute the differences for each signal axis, unfold the
-        # signal axes and stack the differences over the signal
-        # axis.
+        # signal axes and write the differences one after the other
+        # over the signal axis of a single output array.
         if diff_axes is None:
             diff_axes = signal.axes_manager.signal_axes
             iaxes = [axis.index_in_axes_manager for axis in diff_axes]
         else:
             iaxes = diff_axes
-        diffs = [signal.derivative(order=diff_order, axis=i) for i in iaxes]
-        for signal in diffs:
-            signal.unfold()
-        signal = stack(diffs, axis=-1)
-        del diffs
+        for j, i in enumerate(iaxes):
+            diff = derivative(order=diff_order, axis=i)
+            diff.unfold()
+            if j == 0:
+                iarray = diff.axes_manager[-1].index_in_array
+                size = diff.data.shape[iarray]
+                shape = list(diff.data.shape)
+                shape[iarray] *= len(iaxes)
+                data = np.empty(shape, dtype=diff.data.dtype)
+                out = diff
+            index = [slice(None)] * data.ndim
+            index[iarray] = slice(j * size, (j + 1) * size)
+            data[tuple(index)] = diff.data
+            del diff
+        out.data = data
+        out.get_dimensions_from_data()
+        signal = out
     return signal
 
 
@@ -100,6 +218,138 @@ def _normalize_components(target, other, function=np.sum):
     other *= coeff
 
 
+def _solve_least_squares(a, b):
+    """Least-squares solution of ``a @ x = b``.
+
+    When ``a`` has full column rank, the solution is obtained from its
+    thin QR decomposition, which is cheaper than forming the
+    pseudo-inverse of ``a``.
+    """
+    m, n = a.shape
+    if n <= m:
+        q, r = np.linalg.qr(a)
+        diag = np.abs(np.diag(r))
+        if diag.min() > max(m, n) * np.finfo(r.dtype).eps * diag.max():
+            return solve_triangular(r, q.conj().T @ b)
+    return np.linalg.pinv(a) @ b
+
+
+def _solve_unmixing(a, w):
+    """Compute ``a @ inv(w)`` without forming the inverse of ``w``.
+
+    The solution is obtained from the LU decomposition of ``w``, or by
+    least squares if ``w`` is singular. ``a`` can be a numpy or dask array.
+    """
+    with warnings.catch_warnings():
+        # The singular case is handled below
+        warnings.simplefilter("ignore", LinAlgWarning)
+        lu_piv = lu_factor(w)
+
+    if np.any(np.diag(lu_piv[0]) == 0):
+        warnings.warn(
+            "Cannot invert unmixing matrix as it is singular. "
+            "Will attempt to use np.linalg.lstsq instead.",
+            UserWarning,
+        )
+
+        def solve(b):
+            return np.linalg.lstsq(w.T, b.T, rcond=None)[0].T
+
+    else:
+
+        def solve(b):
+            return lu_solve(lu_piv, b.T, trans=1).T
+
+    if isinstance(a, da.Array):
+        return a.rechunk({1: -1}).map_blocks(solve, dtype=np.result_type(a, w))
+    return solve(a)
+
+
+def _as_dask_array(a, chunks):
+    """Wrap a numpy array in a dask array, without copying it."""
+    if isinstance(a, da.Array):
+        return a
+    return da.from_array(a, chunks=chunks)
+
+
+def _matmul_by_blocks(a, b, c=None):
+    """Compute ``a @ b + c`` by blocks of rows of ``a``.
+
+    Each block of the product is written directly in the output array
+    and is small enough to remain in the CPU cache while ``c``, if not
+    None, is added to it. ``c`` must be broadcastable to the shape of
+    the product.
+    """
+    out = np.empty((a.shape[0], b.shape[1]), dtype=np.result_type(a, b))
+    if c is not None:
+        c = np.broadcast_to(c, out.shape)
+    # Blocks of about 2**17 elements, i.e. 1 MB for float64
+    step = max(1, 2**17 // max(1, b.shape[1]))
+    for i in range(0, a.shape[0], step):
+        block = out[i : i + step]
+        np.matmul(a[i : i + step], b, out=block)
+        if c is not None:
+            block += c[i : i + step]
+    return out
+
+
+def _sum_by_cluster(cluster_labels, data):
+    """Sum the rows of ``data`` belonging to each cluster.
+
+    ``cluster_labels`` is a boolean array of shape (n_clusters, n_samples).
+    The sums are the product of ``data`` with the sparse indicator matrix
+    of the clusters, which only reads ``data`` once.
+    """
+    if isinstance(data, da.Array):
+        return da.stack([data[labels].sum(axis=0) for labels in cluster_labels])
+    # Same dtype as np.sum
+    dtype = np.add.reduce(data[:0], axis=0).dtype
+    indicator = sparse.csr_matrix(cluster_labels, dtype=dtype)
+    return np.asarray(indicator @ data.astype(dtype, copy=False))
+
+
+def _warm_start_kwargs(data, centers, kwargs):
+    """Keyword arguments initializing KMeans from the centers of a fit
+    with one cluster less.
+
+    As in the k-means++ initialization, the new center is a sample drawn
+    with a probability proportional to its squared distance to the
+    previous centers, using the ``random_state`` of the clustering.
+    """
+    sq_distances = import_sklearn.sklearn.metrics.pairwise.euclidean_distances(
+        data, centers, squared=True
+    ).min(axis=1)
+    random_state = import_sklearn.sklearn.utils.check_random_state(
+        kwargs.get("random_state")
+    )
+    total = sq_distances.sum()
+    if total > 0:
+        new_center = data[random_state.choice(len(data), p=sq_distances / total)]
+    else:
+        # All the samples are on the previous centers
+        new_center = data[random_state.randint(len(data))]
+    return {**kwargs, "init": np.vstack([centers, new_center]), "n_init": 1}
+
+
+def _get_masked_data(dc, navigation_mask, signal_mask):
+    """Select the unmasked data of an unfolded array in a single indexing step.
+
+    ``navigation_mask`` and ``signal_mask`` are either boolean arrays,
+    True for the data to keep, or ``slice(None)``. When both are slices,
+    a view of ``dc`` is returned.
+    """
+    if isinstance(dc, da.Array):
+        # dask doesn't support indexing several axes with arrays at once
+        return dc[navigation_mask][:, signal_mask]
+    if dc.flags.f_contiguous and not dc.flags.c_contiguous:
+        # Index the transposed array, i.e. typically the original data
+        # of the signal, to read the data in memory order
+        return _get_masked_data(dc.T, signal_mask, navigation_mask).T
+    if isinstance(navigation_mask, slice) or isinstance(signal_mask, slice):
+        return dc[navigation_mask, signal_mask]
+    return dc[np.ix_(navigation_mask, signal_mask)]
+
+
 class MVA:
     """Multivariate analysis capabilities for the Signal1D class."""
 
@@ -123,6 +373,7 @@ def decomposition(
         print_info=True,
         svd_solver="auto",
         copy=True,
+        precision=None,
         **kwargs,
     ):
         """Apply a decomposition to a dataset with a choice of algorithms.
@@ -187,8 +438,9 @@ def decomposition(
                 `output_dimension`: if the input data is larger than 500x500 and the
                 number of components to extract is lower than 80% of the smallest
                 dimension of the data, then the more efficient "randomized"
-                method is enabled. Otherwise the exact full SVD is computed and
-                optionally truncated afterwards.
+                method is enabled, using two power iterations if fewer than half of
+                the components are extracted. Otherwise the exact full SVD is
+                computed and optionally truncated afterwards.
             If full:
                 run exact SVD, calling the standard LAPACK solver via
                 :py:func:`scipy.linalg.svd`, and select the components by postprocessing
@@ -199,12 +451,24 @@ def decomposition(
             If randomized:
                 use truncated SVD, calling :py:func:`sklearn.utils.extmath.randomized_svd`
                 to estimate a limited number of components
-        copy : bool, default True
+        copy : bool or "disk", default True
             * If True, stores a copy of the data before any pre-treatments
               such as normalization in ``s._data_before_treatments``. The original
               data can then be restored by calling ``s.undo_treatments()``.
+              No copy is made if no pre-treatment is requested.
+            * If "disk", the copy is stored in a temporary memory-mapped
+              file instead of in memory, which is useful for data that
+              are too large to be copied in memory.
             * If False, no copy is made. This can be beneficial for memory
               usage, but care must be taken since data will be overwritten.
+        precision : {None, "single"}, default None
+            * If None, the decomposition is computed with the precision of
+              the data.
+            * If "single", the data is cast to single precision for the
+              decomposition, which is faster and uses less memory at the
+              expense of accuracy. The results are cast back to the
+              data type of the signal. Only supported by the "SVD"
+              algorithm.
         **kwargs : extra keyword arguments
             Any keyword arguments are passed to the decomposition algorithm.
 
@@ -235,7 +499,7 @@ def decomposition(
         from hyperspy.signal import BaseSignal
 
         # Check data is suitable for decomposition
-        if self.data.dtype.char not in np.typecodes["AllFloat"]:
+        if self.data.dtype.kind not in "fc":
             raise TypeError(
                 "To perform a decomposition the data must be of the "
                 f"float or complex type, but the current type is '{self.data.dtype}'. "
@@ -251,15 +515,7 @@ def decomposition(
             )
 
         # Check for deprecated algorithm arguments
-        algorithms_deprecated = {
-            "fast_svd": "SVD",
-            "svd": "SVD",
-            "fast_mlpca": "MLPCA",
-            "mlpca": "MLPCA",
-            "nmf": "NMF",
-            "RPCA_GoDec": "RPCA",
-        }
-        new_algo = algorithms_deprecated.get(algorithm, None)
+        new_algo = _decomposition_algorithms_deprecated.get(algorithm, None)
         if new_algo:
             if "fast" in algorithm:
                 warnings.warn(
@@ -280,24 +536,29 @@ def decomposition(
             algorithm = new_algo
 
         # Check algorithms requiring output_dimension
-        algorithms_require_dimension = [
-            "MLPCA",
-            "RPCA",
-            "ORPCA",
-            "ORNMF",
-        ]
-        if algorithm in algorithms_require_dimension and output_dimension is None:
+        if (
+            algorithm in _decomposition_algorithms_require_dimension
+            and output_dimension is None
+        ):
             raise ValueError(f"`output_dimension` must be specified for '{algorithm}'")
 
+        if precision not in (None, "single"):
+            raise ValueError(
+                f"`precision` must be one of [None, 'single'], not '{precision}'"
+            )
+        if precision == "single" and algorithm != "SVD":
+            raise ValueError(
+                "`precision='single'` is only supported by the 'SVD' algorithm"
+            )
+
+        if copy not in (True, False, "disk"):
+            raise ValueError(
+                f"`copy` must be one of [True, False, 'disk'], not '{copy}'"
+            )
+
         # Check sklearn-like algorithms
         is_sklearn_like = False
-        algorithms_sklearn = [
-            "sklearn_pca",
-            "NMF",
-            "sparse_pca",
-            "mini_batch_sparse_pca",
-        ]
-        if algorithm in algorithms_sklearn:
+        if algorithm in _decomposition_algorithms_sklearn:
             if not import_sklearn.sklearn_installed:
                 raise ImportError(f"algorithm='{algorithm}' requires scikit-learn")
 
@@ -353,9 +614,23 @@ def decomposition(
         self._check_signal_mask(signal_mask)
 
         # Backup the original data (on by default to
-        # mimic previous behaviour)
+        # mimic previous behaviour). The data are only modified
+        # by the pre-treatments, so there is nothing to backup
+        # when none of them is requested.
+        if not normalize_poissonian_noise and centre is None:
+            copy = False
         if copy:
-            self._data_before_treatments = self.data.copy()
+            if copy == "disk":
+                # The temporary file is removed when the backup is deleted
+                self._data_before_treatments = np.memmap(
+                    tempfile.TemporaryFile(),
+                    dtype=self.data.dtype,
+                    mode="w+",
+                    shape=self.data.shape,
+                )
+                self._data_before_treatments[:] = self.data
+            else:
+                self._data_before_treatments = self.data.copy()
 
         # set the output target (peak results or not?)
         target = LearningResults()
@@ -393,10 +668,13 @@ def decomposition(
             # The rest of the code assumes that the first data axis
             # is the navigation axis. We transpose the data if that
             # is not the case.
-            if self.axes_manager[0].index_in_array == 0:
+            axes_manager = self.axes_manager
+            if axes_manager[0].index_in_array == 0:
                 dc = self.data
             else:
                 dc = self.data.T
+            signal_shape = axes_manager._signal_shape_in_array
+            navigation_shape = axes_manager._navigation_shape_in_array
 
             # Transform the None masks in slices to get the right behaviour
             if navigation_mask is None:
@@ -413,7 +691,7 @@ def decomposition(
             # stored value (at the end of the method) coincides with the
             # input masks
 
-            data_ = dc[:, signal_mask][navigation_mask, :]
+            data_ = _get_masked_data(dc, navigation_mask, signal_mask)
             if data_.size == 0:
                 raise ValueError("All the data are masked, change the mask.")
 
@@ -425,14 +703,27 @@ def decomposition(
             mean = None
 
             if algorithm == "SVD":
+                if precision == "single":
+                    single = np.complex64 if np.iscomplexobj(data_) else np.float32
+                    svd_data = data_.astype(single, copy=False)
+                else:
+                    svd_data = data_
                 factors, loadings, explained_variance, mean = svd_pca(
-                    data_,
+                    svd_data,
                     svd_solver=svd_solver,
                     output_dimension=output_dimension,
                     centre=centre,
                     auto_transpose=auto_transpose,
                     **kwargs,
                 )
+                if svd_data.dtype != data_.dtype:
+                    factors = factors.astype(data_.dtype)
+                    loadings = loadings.astype(data_.dtype)
+                    explained_variance = explained_variance.astype(
+                        data_.real.dtype
+                    )
+                    if mean is not None:
+                        mean = mean.astype(data_.dtype)
 
             elif algorithm == "MLPCA":
                 if var_array is not None and var_func is not None:
@@ -465,16 +756,20 @@ def decomposition(
                     data_, var_array, output_dimension, svd_solver=svd_solver, **kwargs,
                 )
 
-                loadings = U * S
+                U *= S
+                loadings = U
                 factors = V
-                explained_variance = S ** 2 / len(factors)
+                explained_variance = S ** 2
+                explained_variance /= len(factors)
 
             elif algorithm == "RPCA":
                 X, E, U, S, V = rpca_godec(data_, rank=output_dimension, **kwargs)
 
-                loadings = U * S
+                U *= S
+                loadings = U
                 factors = V
-                explained_variance = S ** 2 / len(factors)
+                explained_variance = S ** 2
+                explained_variance /= len(factors)
 
                 if return_info:
                     to_return = (X, E)
@@ -485,9 +780,11 @@ def decomposition(
                         data_, rank=output_dimension, store_error=True, **kwargs
                     )
 
-                    loadings = U * S
+                    U *= S
+                    loadings = U
                     factors = V
-                    explained_variance = S ** 2 / len(factors)
+                    explained_variance = S ** 2
+                    explained_variance /= len(factors)
 
                     to_return = (X, E)
 
@@ -595,15 +892,23 @@ def decomposition(
 
             if reproject in ("navigation", "both"):
                 if not is_sklearn_like:
-                    loadings_ = (dc[:, signal_mask] - mean) @ factors
+                    # Project the data and subtract the projection of the
+                    # mean afterwards to avoid centering a copy of the data
+                    loadings_ = dc[:, signal_mask] @ factors
+                    if np.any(mean):
+                        mean_ = np.atleast_2d(mean)
+                        if mean_.shape[1] == 1:
+                            loadings_ -= mean_ * factors.sum(axis=0)
+                        else:
+                            loadings_ -= mean_ @ factors
                 else:
                     loadings_ = estim.transform(dc[:, signal_mask])
                 target.loadings = loadings_
 
             if reproject in ("signal", "both"):
                 if not is_sklearn_like:
-                    factors = (
-                        np.linalg.pinv(loadings) @ (dc[navigation_mask, :] - mean)
+                    factors = _solve_least_squares(
+                        loadings, dc[navigation_mask, :] - mean
                     ).T
                     target.factors = factors
                 else:
@@ -619,36 +924,48 @@ def decomposition(
 
             # Rescale the results if the noise was normalized
             if normalize_poissonian_noise:
-                target.factors[:] *= self._root_bH.T
-                target.loadings[:] *= self._root_aG
+                np.multiply(
+                    target.factors,
+                    self._root_bH.T.astype(target.factors.dtype, copy=False),
+                    out=target.factors,
+                )
+                np.multiply(
+                    target.loadings,
+                    self._root_aG.astype(target.loadings.dtype, copy=False),
+                    out=target.loadings,
+                )
 
             # Set the pixels that were not processed to nan
             if not isinstance(signal_mask, slice):
                 # Store the (inverted, as inputed) signal mask
-                target.signal_mask = ~signal_mask.reshape(
-                    self.axes_manager._signal_shape_in_array
-                )
+                target.signal_mask = ~signal_mask.reshape(signal_shape)
                 if reproject not in ("both", "signal"):
-                    factors = np.zeros((dc.shape[-1], target.factors.shape[1]))
+                    factors = np.full(
+                        (dc.shape[-1], target.factors.shape[1]),
+                        np.nan,
+                        dtype=target.factors.dtype,
+                    )
                     factors[signal_mask, :] = target.factors
-                    factors[~signal_mask, :] = np.nan
                     target.factors = factors
 
             if not isinstance(navigation_mask, slice):
                 # Store the (inverted, as inputed) navigation mask
-                target.navigation_mask = ~navigation_mask.reshape(
-                    self.axes_manager._navigation_shape_in_array
-                )
+                target.navigation_mask = ~navigation_mask.reshape(navigation_shape)
                 if reproject not in ("both", "navigation"):
-                    loadings = np.zeros((dc.shape[0], target.loadings.shape[1]))
+                    loadings = np.full(
+                        (dc.shape[0], target.loadings.shape[1]),
+                        np.nan,
+                        dtype=target.loadings.dtype,
+                    )
                     loadings[navigation_mask, :] = target.loadings
-                    loadings[~navigation_mask, :] = np.nan
                     target.loadings = loadings
 
         finally:
             if self._unfolded4decomposition:
                 self.fold()
                 self._unfolded4decomposition = False
+            # Discard the whitening matrix of the previous factors
+            target._whitening_cache = None
             self.learning_results.__dict__.update(target.__dict__)
 
             # Undo any pre-treatments by restoring the copied data
@@ -845,7 +1162,16 @@ def blind_source_separation(
             else:
                 raise ValueError("No `number_of_components` or `comp_list` provided")
 
-        factors = stack([factors.inav[i] for i in comp_list])
+        # Take a copy of the selected components, which can be modified
+        # by the pre-treatments
+        factors = factors._deepcopy_with_new_data(
+            np.take(
+                factors.data,
+                list(comp_list),
+                axis=factors.axes_manager.navigation_axes[0].index_in_array,
+            )
+        )
+        factors.get_dimensions_from_data()
 
         # Check sklearn-like algorithms
         is_sklearn_like = False
@@ -899,29 +1225,26 @@ def blind_source_separation(
                 factors, diff_axes=diff_axes, diff_order=diff_order
             )
             if mask is not None:
-                # The following is a little trick to dilate the mask as
-                # required when operating on differences. It exploits the
-                # fact that np.diff automatically "dilates" nans. The trick has
-                # a memory penalty which should be low compare to the total
-                # memory required for the core application in most cases.
+                # Dilate the mask as required when operating on differences
                 mask_diff_axes = (
                     [iaxis - 1 for iaxis in diff_axes]
                     if diff_axes is not None
                     else None
                 )
-                mask.change_dtype("float")
-                mask.data[mask.data == 1] = np.nan
                 mask = _get_derivative(
-                    mask, diff_axes=mask_diff_axes, diff_order=diff_order
+                    mask,
+                    diff_axes=mask_diff_axes,
+                    diff_order=diff_order,
+                    is_mask=True,
                 )
-                mask.data[np.isnan(mask.data)] = 1
-                mask.change_dtype("bool")
 
         # Unfold in case the signal_dimension > 1
+        # The factors are used as a Fortran-ordered (channels, components)
+        # array, i.e. the transpose of the contiguous unfolded data
         factors.unfold()
         if mask is not None:
             mask.unfold()
-            factors = factors.data.T[np.where(~mask.data)]
+            factors = factors.data[:, ~mask.data].T
         else:
             factors = factors.data.T
 
@@ -929,9 +1252,27 @@ def blind_source_separation(
         if whiten_method is not None:
             _logger.info(f"Whitening the data with method '{whiten_method}'")
 
-            factors, invsqcovmat = whiten_data(
-                factors, centre=True, method=whiten_method
+            # The whitening matrix only depends on the separated data, so
+            # it is reused when the same data is separated again, e.g.
+            # with another algorithm
+            whitening_key = (
+                whiten_method,
+                factors.shape,
+                factors.dtype.str,
+                hashlib.sha1(np.ascontiguousarray(factors.T)).hexdigest(),
             )
+            if (
+                lr._whitening_cache is not None
+                and lr._whitening_cache[0] == whitening_key
+            ):
+                invsqcovmat = lr._whitening_cache[1]
+                factors -= factors.mean(axis=0)
+                factors = factors @ invsqcovmat.T
+            else:
+                factors, invsqcovmat = whiten_data(
+                    factors, centre=True, method=whiten_method
+                )
+                lr._whitening_cache = (whitening_key, invsqcovmat)
 
         # Perform BSS
         if algorithm == "orthomax":
@@ -952,10 +1293,12 @@ def blind_source_separation(
                 to_return = lr.bss_node
 
         elif is_sklearn_like:
-            if hasattr(estim, "fit_transform"):
-                _ = estim.fit_transform(factors)
-            elif hasattr(estim, "fit") and hasattr(estim, "transform"):
+            # Only the fitted estimator is needed, so avoid computing the
+            # transformed data with fit_transform if possible
+            if hasattr(estim, "fit"):
                 estim.fit(factors)
+            else:
+                estim.fit_transform(factors)
 
             # Handle sklearn.pipeline.Pipeline objects
             # by taking the last step
@@ -999,16 +1342,18 @@ def blind_source_separation(
             w = unmixing_matrix
 
         if lr.explained_variance is not None:
-            if hasattr(lr.explained_variance, "compute"):
-                lr.explained_variance = lr.explained_variance.compute()
+            # Only the explained variance of the separated components
+            # is needed, so don't compute the rest if it is lazy
+            explained_variance = lr.explained_variance[:number_of_components]
+            if hasattr(explained_variance, "compute"):
+                explained_variance = explained_variance.compute()
 
             # The output of ICA is not sorted in any way what makes it
             # difficult to compare results from different unmixings. The
             # following code is an experimental attempt to sort them in a
             # more predictable way
-            sorting_indices = np.argsort(
-                lr.explained_variance[:number_of_components] @ np.abs(w.T)
-            )[::-1]
+            score = np.abs(w) @ explained_variance
+            sorting_indices = np.argsort(-score, kind="stable")
             w[:] = w[sorting_indices, :]
 
         lr.unmixing_matrix = w
@@ -1103,11 +1448,10 @@ def reverse_decomposition_component(self, component_number):
             )
         else:
             target = self.learning_results
-
-            for i in [component_number]:
-                _logger.info(f"Component {i} reversed")
-                target.factors[:, i] *= -1
-                target.loadings[:, i] *= -1
+            indices = np.atleast_1d(np.asarray(component_number, dtype=np.intp))
+            _logger.info(f"Component(s) {component_number} reversed")
+            target.factors[:, indices] *= -1
+            target.loadings[:, indices] *= -1
 
     def reverse_bss_component(self, component_number):
         """Reverse the independent component.
@@ -1133,63 +1477,55 @@ def reverse_bss_component(self, component_number):
             )
         else:
             target = self.learning_results
-
-            for i in [component_number]:
-                _logger.info(f"Component {i} reversed")
-                target.bss_factors[:, i] *= -1
-                target.bss_loadings[:, i] *= -1
-                target.unmixing_matrix[i, :] *= -1
+            indices = np.atleast_1d(np.asarray(component_number, dtype=np.intp))
+            _logger.info(f"Component(s) {component_number} reversed")
+            target.bss_factors[:, indices] *= -1
+            target.bss_loadings[:, indices] *= -1
+            target.unmixing_matrix[indices, :] *= -1
 
     def _unmix_components(self, compute=False):
         lr = self.learning_results
         w = lr.unmixing_matrix
         n = len(w)
 
-        try:
-            w_inv = np.linalg.inv(w)
-        except np.linalg.LinAlgError as e:
-            if "Singular matrix" in str(e):
-                warnings.warn(
-                    "Cannot invert unmixing matrix as it is singular. "
-                    "Will attempt to use np.linalg.pinv instead.",
-                    UserWarning,
-                )
-                w_inv = np.linalg.pinv(w)
-            else:
-                raise
-
         if lr.on_loadings:
             lr.bss_loadings = lr.loadings[:, :n] @ w.T
-            lr.bss_factors = lr.factors[:, :n] @ w_inv
+            lr.bss_factors = _solve_unmixing(lr.factors[:, :n], w)
         else:
             lr.bss_factors = lr.factors[:, :n] @ w.T
-            lr.bss_loadings = lr.loadings[:, :n] @ w_inv
+            lr.bss_loadings = _solve_unmixing(lr.loadings[:, :n], w)
         if compute:
             lr.bss_factors = lr.bss_factors.compute()
             lr.bss_loadings = lr.bss_loadings.compute()
 
     def _auto_reverse_bss_component(self, reverse_component_criterion):
-        n_components = self.learning_results.bss_factors.shape[1]
-        for i in range(n_components):
-            if reverse_component_criterion == "factors":
-                values = self.learning_results.bss_factors
-            elif reverse_component_criterion == "loadings":
-                values = self.learning_results.bss_loadings
-            else:
-                raise ValueError(
-                    "`reverse_component_criterion` can take only "
-                    "`factor` or `loading` as parameter."
-                )
-            minimum = np.nanmin(values[:, i])
-            maximum = np.nanmax(values[:, i])
-            if minimum < 0 and -minimum > maximum:
-                self.reverse_bss_component(i)
+        if reverse_component_criterion == "factors":
+            values = self.learning_results.bss_factors
+        elif reverse_component_criterion == "loadings":
+            values = self.learning_results.bss_loadings
+        else:
+            raise ValueError(
+                "`reverse_component_criterion` can take only "
+                "`factor` or `loading` as parameter."
+            )
+        # Find all the components to reverse in a single pass
+        if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+            minimum, maximum = numba_nanminmax(values)
+        else:
+            minimum = np.asarray(np.nanmin(values, axis=0))
+            maximum = np.asarray(np.nanmax(values, axis=0))
+        to_reverse = np.flatnonzero((minimum < 0) & (-minimum > maximum))
+        if to_reverse.size:
+            self.reverse_bss_component(to_reverse)
+            for i in to_reverse:
                 _logger.info(
                     f"Independent component {i} reversed based "
                     f"on the {reverse_component_criterion}"
                 )
 
-    def _calculate_recmatrix(self, components=None, mva_type="decomposition"):
+    def _calculate_recmatrix(
+        self, components=None, mva_type="decomposition", chunks=None
+    ):
         """Rebuilds data from selected components.
 
         Parameters
@@ -1200,6 +1536,9 @@ def _calculate_recmatrix(self, components=None, mva_type="decomposition"):
             * If list of ints, rebuilds signal instance from only components in given list
         mva_type : str {'decomposition', 'bss'}
             Decomposition type (not case sensitive)
+        chunks : None, int, tuple or str, default None
+            If not None, in-memory factors and loadings are converted to
+            dask arrays with the given chunks to build the data lazily.
 
         Returns
         -------
@@ -1212,33 +1551,49 @@ def _calculate_recmatrix(self, components=None, mva_type="decomposition"):
 
         if mva_type.lower() == "decomposition":
             factors = target.factors
-            loadings = target.loadings.T
+            loadings = target.loadings
         elif mva_type.lower() == "bss":
             factors = target.bss_factors
-            loadings = target.bss_loadings.T
+            loadings = target.bss_loadings
+
+        if chunks is not None:
+            factors = _as_dask_array(factors, chunks)
+            loadings = _as_dask_array(loadings, chunks)
 
         if components is None:
-            a = factors @ loadings
             signal_name = f"model from {mva_type} with {factors.shape[1]} components"
         elif hasattr(components, "__iter__"):
-            tfactors = np.zeros((factors.shape[0], len(components)))
-            tloadings = np.zeros((len(components), loadings.shape[1]))
-            for i in range(len(components)):
-                tfactors[:, i] = factors[:, components[i]]
-                tloadings[i, :] = loadings[components[i], :]
-            a = tfactors @ tloadings
+            components_ = list(components)
+            factors = factors[:, components_]
+            loadings = loadings[:, components_]
             signal_name = f"model from {mva_type} with components {components}"
         else:
-            a = factors[:, :components] @ loadings[:components, :]
+            factors = factors[:, :components]
+            loadings = loadings[:, :components]
             signal_name = f"model from {mva_type} with {components} components"
 
+        # The product is computed in the (navigation, signal) layout of
+        # the unfolded data so that it can be reshaped without a copy
+        mean = target.mean
+        if isinstance(factors, da.Array) or isinstance(loadings, da.Array):
+            a = loadings @ factors.T
+        else:
+            # Add the mean while each block of the product is in cache
+            a = _matmul_by_blocks(loadings, factors.T, mean)
+            mean = None
+
         self._unfolded4decomposition = self.unfold()
         try:
-            sc = self.deepcopy()
-            sc.data = a.T.reshape(self.data.shape)
+            # Avoid copying the data, which is replaced by the model
+            sc = self._deepcopy_with_new_data(
+                a.reshape(self.data.shape),
+                copy_variance=True,
+                copy_navigator=True,
+                copy_learning_results=True,
+            )
             sc.metadata.General.title += " " + signal_name
-            if target.mean is not None:
-                sc.data += target.mean
+            if mean is not None:
+                sc.data += mean
         finally:
             if self._unfolded4decomposition:
                 self.fold()
@@ -1275,6 +1630,9 @@ def get_bss_model(self, components=None, chunks="auto"):
             * If None, rebuilds signal instance from all components
             * If int, rebuilds signal instance from components in range 0-given int
             * If list of ints, rebuilds signal instance from only components in given list
+        chunks : int, tuple or str, default "auto"
+            Chunks of the dask arrays used to build the model of a lazy
+            signal from in-memory BSS results.
 
         Returns
         -------
@@ -1282,13 +1640,11 @@ def get_bss_model(self, components=None, chunks="auto"):
             A model built from the given components.
 
         """
-        lr = self.learning_results
-        if self._lazy:
-            if isinstance(lr.bss_factors, np.ndarray):
-                lr.factors = da.from_array(lr.bss_factors, chunks=chunks)
-            if isinstance(lr.bss_factors, np.ndarray):
-                lr.loadings = da.from_array(lr.bss_loadings, chunks=chunks)
-        rec = self._calculate_recmatrix(components=components, mva_type="bss")
+        rec = self._calculate_recmatrix(
+            components=components,
+            mva_type="bss",
+            chunks=chunks if self._lazy else None,
+        )
         return rec
 
     def get_explained_variance_ratio(self):
@@ -1481,25 +1837,11 @@ def plot_explained_variance_ratio(
         else:
             hline = False
 
-        # Some default formatting for signal markers
+        # Some default formatting for signal and noise markers
         if signal_fmt is None:
-            signal_fmt = {
-                "c": "#C24D52",
-                "linestyle": "",
-                "marker": "^",
-                "markersize": 10,
-                "zorder": 3,
-            }
-
-        # Some default formatting for noise markers
+            signal_fmt = _scree_plot_signal_fmt
         if noise_fmt is None:
-            noise_fmt = {
-                "c": "#4A70B0",
-                "linestyle": "",
-                "marker": "o",
-                "markersize": 10,
-                "zorder": 3,
-            }
+            noise_fmt = _scree_plot_noise_fmt
 
         # Sane defaults for xaxis labeling
         if xaxis_labeling is None:
@@ -1589,13 +1931,12 @@ def plot_cumulative_explained_variance_ratio(self, n=50):
         target = self.learning_results
         if n > target.explained_variance.shape[0]:
             n = target.explained_variance.shape[0]
-        cumu = np.cumsum(target.explained_variance) / np.sum(target.explained_variance)
-        fig = plt.figure()
-        ax = fig.add_subplot(111)
+        cumu = target._get_cumulative_explained_variance_ratio()
+        fig, ax = plt.subplots()
         ax.scatter(range(n), cumu[:n])
         ax.set_xlabel("Principal component")
         ax.set_ylabel("Cumulative explained variance ratio")
-        plt.draw()
+        fig.canvas.draw_idle()
 
         return ax
 
@@ -1632,30 +1973,49 @@ def normalize_poissonian_noise(self, navigation_mask=None, signal_mask=None):
             else:
                 signal_mask = ~signal_mask
 
-            if dc[:, signal_mask][navigation_mask, :].size == 0:
+            # Select the unmasked data once. It is a copy if a mask is
+            # given, in which case it is written back at the end
+            data = _get_masked_data(dc, navigation_mask, signal_mask)
+
+            if data.size == 0:
                 raise ValueError("All the data are masked, change the mask.")
 
+            # Compute the sums and the minimum in a single pass if possible
+            use_numba = data.dtype.kind == "f" and data.dtype.isnative
+            if use_numba:
+                aG, bH, minimum = numba_row_column_sums(data)
+            else:
+                aG, bH, minimum = data.sum(1), data.sum(0), data.min()
+
             # Check non-negative
-            if dc[:, signal_mask][navigation_mask, :].min() < 0.0:
+            if minimum < 0.0:
                 raise ValueError(
                     "Negative values found in data!\n"
                     "Are you sure that the data follow a Poisson distribution?"
                 )
 
             # Rescale the data to normalize the Poisson noise
-            aG = dc[:, signal_mask][navigation_mask, :].sum(1).squeeze()
-            bH = dc[:, signal_mask][navigation_mask, :].sum(0).squeeze()
-
             self._root_aG = np.sqrt(aG)[:, np.newaxis]
             self._root_bH = np.sqrt(bH)[np.newaxis, :]
 
-            # We ignore numpy's warning when the result of an
-            # operation produces nans - instead we set 0/0 = 0
-            with np.errstate(divide="ignore", invalid="ignore"):
-                dc[:, signal_mask][navigation_mask, :] /= self._root_aG * self._root_bH
-                dc[:, signal_mask][navigation_mask, :] = np.nan_to_num(
-                    dc[:, signal_mask][navigation_mask, :]
+            if use_numba:
+                # 0/0 is set to 0
+                numba_divide_rows_columns(
+                    data, self._root_aG.ravel(), self._root_bH.ravel()
                 )
+            else:
+                # We ignore numpy's warning when the result of an
+                # operation produces nans - instead we set 0/0 = 0
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    data /= self._root_aG * self._root_bH
+                    np.nan_to_num(data, copy=False)
+
+            if isinstance(navigation_mask, slice) and isinstance(signal_mask, slice):
+                return
+            if isinstance(navigation_mask, slice) or isinstance(signal_mask, slice):
+                dc[navigation_mask, signal_mask] = data
+            else:
+                dc[np.ix_(navigation_mask, signal_mask)] = data
 
     def undo_treatments(self):
         """Undo Poisson noise normalization and other pre-treatments.
@@ -1818,8 +2178,7 @@ def plot_cluster_metric(self):
                              "please run evaluate_number_of_clusters first.")
         if target.cluster_metric_index is not None:
             xdata = target.cluster_metric_index
-        fig = plt.figure()
-        ax = fig.add_subplot(111)
+        fig, ax = plt.subplots()
         ax.scatter(xdata, ydata)
         ax.set_xlabel('number of clusters')
         label =  str(target.cluster_metric) +"_metric"
@@ -1851,7 +2210,7 @@ def plot_cluster_metric(self):
                     color='green',
                     linestyle='dashed')
 
-        plt.draw()
+        fig.canvas.draw_idle()
         return ax
 
 
@@ -1939,7 +2298,7 @@ def _get_cluster_signal(self,cluster_source,number_of_components=None,
                 cluster_source.unfolded4clustering=cluster_source.unfold()
             data = cluster_source.data \
                 if cluster_source.axes_manager[0].index_in_array == 0 else cluster_source.data.T
-            toreturn = data[:,signal_mask][navigation_mask,:]
+            toreturn = _get_masked_data(data, navigation_mask, signal_mask)
         elif type(cluster_source) is str:
             if cluster_source == "bss":
                 loadings = self.learning_results.bss_loadings
@@ -2085,34 +2444,44 @@ def cluster_analysis(self,
 
             n_clusters = int(np.amax(alg.labels_)) + 1
             # Sort the labels based on clustersize from high to low
-            clustersizes = np.asarray([(alg.labels_ == i).sum() for i in range(n_clusters)])
+            labels = np.asarray(alg.labels_)
+            clustersizes = np.bincount(labels[labels >= 0], minlength=n_clusters)
             idxs = np.argsort(clustersizes)[::-1]
-            cluster_labels = np.zeros(
-                (n_clusters, self.axes_manager.navigation_size), dtype="bool")
+            navigation_size = self.axes_manager.navigation_size
+            cluster_labels = np.zeros((n_clusters, navigation_size), dtype="bool")
             nav_mask = self._mask_for_clustering(navigation_mask)
-            for i, j  in enumerate(idxs):
-                cluster_labels[j, nav_mask] = alg.labels_ == i
+            # Set the cluster of each sample in a single assignment
+            samples = np.arange(navigation_size)[nav_mask]
+            clustered = labels >= 0
+            cluster_labels[idxs[labels[clustered]], samples[clustered]] = True
+            # Group the indices of the clustered samples by cluster, the
+            # members of cluster i being order[bounds[i]:bounds[i + 1]]
+            rows = np.full(labels.size, -1)
+            rows[clustered] = idxs[labels[clustered]]
+            order = np.argsort(rows, kind="stable")
+            bounds = np.searchsorted(rows[order], np.arange(n_clusters + 1))
             # Calculate cluster centers
             cluster_sum_signals = []
             cluster_centroid_signals = []
             centroids = []
-            distances = np.full(
-                (n_clusters, self.axes_manager.navigation_size,), np.nan, dtype="float")
+            distances = np.full((n_clusters, navigation_size), np.nan, dtype="float")
             if isinstance(source_for_centers, str) and source_for_centers in ("decomposition", "bss"):
                 loadings = self.learning_results.loadings[:, :number_of_components]
                 factors  = self.learning_results.factors[:, :number_of_components]
+                # Sum the loadings of each cluster and reproject all the
+                # clusters at once
+                cluster_sum_signals = _sum_by_cluster(cluster_labels, loadings) @ factors.T
+                closest = []
                 for i in range(n_clusters):
-                    sloadings = loadings[cluster_labels[i, :], :].sum(0, keepdims=True)
-                    cluster_sum_signals.append((sloadings @ factors.T).squeeze())
-                    cdata = scaled_data[cluster_labels[i, :][nav_mask], :]
+                    cdata = scaled_data[order[bounds[i] : bounds[i + 1]], :]
                     centroid = cdata.mean(0)
                     centroids.append(centroid)
                     # Calculate the distances to the whole dataset, except for
                     # the masked areas
                     cdist = np.linalg.norm(scaled_data - centroid[np.newaxis, :], axis=1)
-                    mloadings = loadings[nav_mask, ...][np.argmin(cdist), ...]
-                    cluster_centroid_signals.append((mloadings @ factors.T).squeeze())
+                    closest.append(np.argmin(cdist))
                     distances[i, nav_mask] = cdist
+                cluster_centroid_signals = loadings[nav_mask, ...][closest, ...] @ factors.T
             else:
                 cluster_data = \
                     self._get_cluster_signal(
@@ -2120,11 +2489,10 @@ def cluster_analysis(self,
                         number_of_components,
                         navigation_mask=None,
                         signal_mask=None)
+                cluster_sum_signals = _sum_by_cluster(cluster_labels, cluster_data)
                 for i in range(n_clusters):
-                    cluster_sum_signal = np.sum(cluster_data[cluster_labels[i, :], ...], axis=0)
-                    cluster_sum_signals.append(cluster_sum_signal)
                     # Calculate centroid
-                    cdata = scaled_data[cluster_labels[i, :][nav_mask], :]
+                    cdata = scaled_data[order[bounds[i] : bounds[i + 1]], :]
                     centroid = cdata.mean(0)
                     centroids.append(centroid)
                     # Calculate the distances to the whole dataset, except for
@@ -2206,7 +2574,7 @@ def _get_cluster_preprocessing_algorithm(self, algorithm, **kwargs):
         return process_algorithm
 
     def _distances_within_cluster(self, cluster_data, memberships,
-                                  squared=True, summed=False):
+                                  squared=True, summed=False, n_clusters=None):
         """Return inter cluster distances.
 
         Parameters
@@ -2223,22 +2591,74 @@ def _distances_within_cluster(self, cluster_data, memberships,
             If True returns a sum of all distances within a cluster.
             The results are scaled by 2*number of cluster points.
             The default is False.
+        n_clusters : int, optional
+            Number of clusters. If None, it is the largest label plus one.
 
         Returns
         -------
-        result : list
-            list of distances for within the cluster
+        result : list or ndarray
+            list of distances for within the cluster or, if summed is True,
+            array of the summed distances of each cluster
 
         """
+        memberships = np.asarray(memberships)
+        if n_clusters is None:
+            n_clusters = np.max(memberships) + 1
+        if squared:
+            # The mean squared distance from a point to the other points
+            # of its cluster is its squared distance to the cluster mean
+            # plus the mean of these squared distances, so that the
+            # pairwise distance matrix doesn't need to be calculated.
+            # All the clusters are reduced together in a single pass.
+            if summed and isinstance(cluster_data, np.ndarray) and \
+                    cluster_data.dtype.kind == "f":
+                # The distances of a cluster sum to its squared distances
+                return numba_within_cluster_sums(
+                    cluster_data, memberships, n_clusters
+                )
+            clustered = memberships >= 0
+            if not clustered.all():
+                cluster_data = cluster_data[clustered]
+                memberships = memberships[clustered]
+            n = memberships.size
+            counts = np.bincount(memberships, minlength=n_clusters)
+            indicator = sparse.csr_matrix(
+                (np.ones(n), (memberships, np.arange(n))), shape=(n_clusters, n)
+            )
+            # Empty clusters have a zero sum, which doesn't need scaling
+            means = (indicator @ cluster_data) / \
+                np.maximum(counts, 1)[:, np.newaxis]
+            diff = cluster_data - means[memberships]
+            sq_distances = np.einsum("ij,ij->i", diff, diff)
+            sq_sums = np.bincount(
+                memberships, weights=sq_distances, minlength=n_clusters
+            )
+            if summed:
+                # The distances of a cluster sum to its squared distances
+                return sq_sums
+            # Empty clusters have no distances
+            mean_sq_sums = np.divide(
+                sq_sums, counts, out=np.zeros_like(sq_sums), where=counts > 0
+            )
+            sq_distances += mean_sq_sums[memberships]
+            sq_distances /= 2.0
+            order = np.argsort(memberships, kind="stable")
+            return np.split(sq_distances[order], np.cumsum(counts)[:-1])
+
+        # Group the samples by cluster with a single sort of the labels,
+        # the unclustered samples with negative labels are sorted first
+        clustered = memberships >= 0
+        counts = np.bincount(memberships[clustered], minlength=n_clusters)
+        order = np.argsort(memberships, kind="stable")
+        order = order[np.count_nonzero(~clustered):]
         distances = \
             [import_sklearn.sklearn.metrics.pairwise.\
-                euclidean_distances(cluster_data[memberships == c, :],
-            squared=squared)
-            for c in range(np.max(memberships) + 1)]
+                euclidean_distances(x, squared=squared)
+            for x in np.split(cluster_data[order], np.cumsum(counts)[:-1])]
         result = [np.mean(x,axis=0) / 2.0 for x in distances]
 
         if summed:
-            result = [np.sum(x) for x in result]
+            result = np.array([np.sum(x) for x in result])
         return result
 
     def estimate_number_of_clusters(self,
@@ -2252,6 +2672,7 @@ def estimate_number_of_clusters(self,
                                     algorithm=None,
                                     metric="gap",
                                     n_ref=4,
+                                    warm_start=False,
                                     **kwargs):
         """Performs cluster analysis of a signal for cluster sizes ranging from
         n_clusters =2 to max_clusters ( default 12)
@@ -2311,13 +2732,31 @@ def estimate_number_of_clusters(self,
             For elbow the optimal k is the knee or elbow point.
             For gap the optimal k is the first k gap(k)>= gap(k+1)-std_error
             For silhouette the optimal k will be one of the "maxima" found with
-            this method
+            this method. The distances between the samples are computed once
+            for all k when the dense distance matrix and the temporaries of
+            its computation fit in scikit-learn's ``working_memory``
+            (see :py:func:`sklearn.set_config`), otherwise they are
+            computed by chunks for every k. The precomputed matrix is held
+            in memory for the whole range of k, trading up to half of the
+            working memory for the duration of the estimation against
+            computing the distances only once. Reduce the working memory
+            to lower the memory usage.
         n_ref :  int, default 4
             Number of references to use in gap statistics method
             Gap statistics compares the results from clustering the data to
             clustering uniformly distributed data. As clustering has
             a random variation it is typically averaged n_ref times
             to get an statistical average
+        warm_start : bool, default False
+            If True and the clustering algorithm is KMeans without a
+            requested ``init`` or ``n_init``, each fit of the data with k
+            clusters is initialized once from the centers found with
+            k - 1 clusters plus a new center drawn as in the k-means++
+            initialization. This reduces the number of iterations of the
+            fits, but their inertias can be higher than with the default
+            multiple initializations, which can change the estimated
+            number of clusters. The reference fits of the gap statistic
+            are not warm-started.
         **kwargs : dict {}  default empty
             Parameters passed to the clustering algorithm.
 
@@ -2370,10 +2809,6 @@ def estimate_number_of_clusters(self,
         #
         if(algorithm == "agglomerative"):
             k_range   = list(range(2, max_clusters+1))
-        if(algorithm == "kmeans" or algorithm == "minibatchkmeans"):
-            if metric == "gap":
-                # set number of averages to 1
-                kwargs['n_init']=1
         if metric =="silhouette":
             k_range   = list(range(2, max_clusters+1))
 
@@ -2395,6 +2830,13 @@ def estimate_number_of_clusters(self,
                 preprocessing=preprocessing,
                 preprocessing_kwargs=preprocessing_kwargs)
 
+            # If requested, KMeans fits of the data are initialized from
+            # the centers found with one cluster less, unless the
+            # initialization is requested
+            warm_start = warm_start and algorithm in (None, "kmeans") and \
+                "init" not in kwargs and "n_init" not in kwargs
+            centers = None
+
             # from 2 to max_clusters
             # cluster and calculate silhouette_score
             if metric == "elbow":
@@ -2402,16 +2844,22 @@ def estimate_number_of_clusters(self,
                 inertia = np.zeros(len(k_range))
 
                 for i,k in enumerate(k_range):
-                    cluster_algorithm = self._get_cluster_algorithm(algorithm,n_clusters=k,**kwargs)
+                    sweep_kwargs = kwargs if centers is None else \
+                        _warm_start_kwargs(scaled_data, centers, kwargs)
+                    cluster_algorithm = self._get_cluster_algorithm(algorithm,n_clusters=k,**sweep_kwargs)
                     alg = self._cluster_analysis(scaled_data,cluster_algorithm)
+                    if warm_start:
+                        centers = alg.cluster_centers_
 
-                    D = self._distances_within_cluster(scaled_data,alg.labels_,summed=True)
-                    W = np.sum(D)
-                    inertia[i]= np.log(W)
+                    D = self._distances_within_cluster(scaled_data,alg.labels_,
+                                                       summed=True,n_clusters=k)
+                    inertia[i] = D.sum()
                     pbar.update(1)
                     _logger.info(
                         f"For n_clusters ={k}. "
-                        f"The distance metric is : {inertia[-1]}")
+                        f"The within cluster dispersion is : {inertia[i]}")
+                # the metric is the log of the dispersions
+                np.log(inertia, out=inertia)
                 to_return = inertia
                 best_k =self.estimate_elbow_position(
                     to_return, log=False) + min_k
@@ -2419,29 +2867,49 @@ def estimate_number_of_clusters(self,
                 k_range   = list(range(2, max_clusters+1))
                 pbar = progressbar(total=len(k_range))
                 silhouette_avg = []
+                # The distances between the samples don't depend on k, so
+                # compute them once if the matrix, with the precision of
+                # the data, and its temporaries fit in the scikit-learn
+                # working memory (MiB)
+                n_samples = scaled_data.shape[0]
+                itemsize = scaled_data.dtype.itemsize \
+                    if scaled_data.dtype.kind == "f" else 8
+                working_memory = \
+                    import_sklearn.sklearn.get_config()["working_memory"]
+                if 2 * itemsize * n_samples ** 2 <= working_memory * 2**20:
+                    distances = import_sklearn.sklearn.metrics.pairwise.\
+                        euclidean_distances(scaled_data)
+                    silhouette_kwargs = {"metric": "precomputed"}
+                else:
+                    distances = scaled_data
+                    silhouette_kwargs = {}
                 for k in k_range:
+                    sweep_kwargs = kwargs if centers is None else \
+                        _warm_start_kwargs(scaled_data, centers, kwargs)
                     cluster_algorithm = \
-                        self._get_cluster_algorithm(algorithm,n_clusters=k,**kwargs)
+                        self._get_cluster_algorithm(algorithm,n_clusters=k,**sweep_kwargs)
                     alg = self._cluster_analysis(scaled_data,cluster_algorithm)
+                    if warm_start:
+                        centers = alg.cluster_centers_
                     cluster_labels = alg.labels_
                     silhouette_avg.append(
                         import_sklearn.sklearn.metrics.silhouette_score(
-                        scaled_data,
-                        cluster_labels))
+                        distances,
+                        cluster_labels,
+                        **silhouette_kwargs))
                     pbar.update(1)
                     _logger.info(
                         f"For n_clusters={k} the average "
                         f"silhouette_score is : {silhouette_avg[-1]}")
+                del distances
                 to_return = silhouette_avg
-                best_k = []
-                max_value = -1.0
-                # find peaks
-                for u in range(len(silhouette_avg)-1):
-                    if ((silhouette_avg[u] > silhouette_avg[u-1]) &
-                            (silhouette_avg[u] > silhouette_avg[u+1])):
-                        best_k.append(u+min_k)
-                        max_value = max(silhouette_avg[u], max_value)
-                if silhouette_avg[0] > max_value:
+                # find the peaks, the first point only counts if it is
+                # higher than all the other peaks
+                sa = np.asarray(silhouette_avg)
+                is_peak = (sa[1:-1] > sa[:-2]) & (sa[1:-1] > sa[2:])
+                peaks = np.flatnonzero(is_peak) + 1
+                best_k = (peaks + min_k).tolist()
+                if sa[0] > sa[peaks].max(initial=-1.0):
                     best_k.insert(0, min_k)
             else:
                 # cluster and calculate gap statistic
@@ -2449,29 +2917,42 @@ def estimate_number_of_clusters(self,
                 reference_inertia = np.zeros(len(k_range))
                 reference_std  = np.zeros(len(k_range))
                 data_inertia=np.zeros(len(k_range))
-                reference=np.zeros(scaled_data.shape)
                 local_inertia = np.zeros(n_ref)
                 pbar = progressbar(total=n_ref*len(k_range))
-                # only perform 1 pass of clustering
-                # otherwise std_dev isn't correct
-                for f_indx in range(scaled_data.shape[1]):
-                    xmin = np.min(scaled_data[:,f_indx])
-                    xmax = np.max(scaled_data[:,f_indx])
-                    reference[:,f_indx]= np.linspace(xmin, xmax, endpoint=True, num=reference[:,0].size)
+                # only perform 1 pass of clustering of the references
+                # otherwise std_dev isn't correct, the data is clustered
+                # with the requested number of initializations or, if
+                # requested, warm-started
+                reference_kwargs = kwargs
+                # None is KMeans
+                if algorithm in (None, "kmeans", "minibatchkmeans"):
+                    reference_kwargs = {**kwargs, "n_init": 1}
+                # The reference spans the range of each feature, with the
+                # precision of the data
+                reference = np.linspace(
+                    np.min(scaled_data, axis=0),
+                    np.max(scaled_data, axis=0),
+                    endpoint=True,
+                    num=scaled_data.shape[0],
+                    dtype=scaled_data.dtype if scaled_data.dtype.kind == "f"
+                    else float,
+                )
 
                 for o_indx,k in enumerate(k_range):
                     # calculate the data metric
-                    if(algorithm=="kmeans"):
-                        kwargs['n_init']=1
+                    sweep_kwargs = kwargs if centers is None else \
+                        _warm_start_kwargs(scaled_data, centers, kwargs)
                     cluster_algorithm = \
-                        self._get_cluster_algorithm(algorithm,n_clusters=k,**kwargs)
+                        self._get_cluster_algorithm(algorithm,n_clusters=k,**sweep_kwargs)
                     alg = self._cluster_analysis(scaled_data,
                                                  cluster_algorithm)
+                    if warm_start:
+                        centers = alg.cluster_centers_
 
                     D = self._distances_within_cluster(scaled_data,alg.labels_,
-                                                 squared=True, summed=True)
-                    W = np.sum(D)
-                    data_inertia[o_indx]=np.log(W)
+                                                 squared=True, summed=True,
+                                                 n_clusters=k)
+                    data_inertia[o_indx] = D.sum()
                     # now do n_ref clusters for a uniform random distribution
                     # to determine "gap" between data and random distribution
 
@@ -2479,16 +2960,19 @@ def estimate_number_of_clusters(self,
                         # initiate with a known seed to make the overall results
                         # repeatable but still sampling different configurations
                         cluster_algorithm = \
-                            self._get_cluster_algorithm(algorithm,n_clusters=k,**kwargs)
+                            self._get_cluster_algorithm(algorithm,n_clusters=k,
+                                                        **reference_kwargs)
                         alg = self._cluster_analysis(reference,
                                                      cluster_algorithm)
                         D = self._distances_within_cluster(reference,alg.labels_,
-                                                 squared=True,summed=True)
-                        W = np.sum(D)
-                        local_inertia[i_indx]=np.log(W)
+                                                 squared=True,summed=True,
+                                                 n_clusters=k)
+                        local_inertia[i_indx] = D.sum()
                         pbar.update(1)
+                    np.log(local_inertia, out=local_inertia)
                     reference_inertia[o_indx]=np.mean(local_inertia)
                     reference_std[o_indx] = np.std(local_inertia)
+                np.log(data_inertia, out=data_inertia)
                 std_error = np.sqrt(1.0 + 1.0/n_ref)*reference_std
                 std_error = np.abs(std_error)
                 gap       = reference_inertia-data_inertia
@@ -2583,26 +3067,17 @@ def estimate_elbow_position(self, explained_variance_ratio=None,log=True,
         # number avoids warnings below when taking np.log(0)
         curve_values_adj = np.clip(curve_values, 1e-30, None)
 
-        x1 = 0
-        x2 = max_points
-
+        ys = curve_values_adj[: max_points + 1]
         if log:
-            y1 = np.log(curve_values_adj[0])
-            y2 = np.log(curve_values_adj[max_points])
-        else:
-            y1 = curve_values_adj[0]
-            y2 = curve_values_adj[max_points]
-
+            ys = np.log(ys)
+        y1 = ys[0]
+        y2 = ys[-1]
         xs = np.arange(max_points)
-        if log:
-            ys = np.log(curve_values_adj[:max_points])
-        else:
-            ys = curve_values_adj[:max_points]
 
-        numer = np.abs((x2 - x1) * (y1 - ys) - (x1 - xs) * (y2 - y1))
-        denom = np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-        distance = np.nan_to_num(numer / denom)
-        elbow_position = np.argmax(distance)
+        # Distance of each point to the line between the end points,
+        # the norm of the line is a constant factor not changing the argmax
+        numer = np.abs(max_points * (y1 - ys[:-1]) + xs * (y2 - y1))
+        elbow_position = np.argmax(np.nan_to_num(numer))
 
         return elbow_position
 
@@ -2642,8 +3117,12 @@ class LearningResults(object):
     # Masks
     navigation_mask = None
     signal_mask = None
+    # Whitening matrix of the last blind source separation
+    _whitening_cache = None
+    # Cumulative explained variance ratio of the current explained variance
+    _cumulative_explained_variance_ratio = None
 
-    def save(self, filename, overwrite=None):
+    def save(self, filename, overwrite=None, compress=False):
         """Save the result of the decomposition and demixing analysis.
 
         Parameters
@@ -2653,22 +3132,28 @@ def save(self, filename, overwrite=None):
         overwrite : {True, False, None}, default None
             If True, overwrite the file if it exists.
             If None (default), prompt user if file exists.
+        compress : bool, default False
+            If True, the results are saved in a compressed ``.npz`` file,
+            which is smaller but slower to write. Both are read by
+            :py:meth:`~.learn.mva.LearningResults.load`.
 
         """
         kwargs = {}
-        for attribute in [
-            v
-            for v in dir(self)
-            if not isinstance(getattr(self, v), types.MethodType)
-            and not v.startswith("_")
-        ]:
-            kwargs[attribute] = self.__getattribute__(attribute)
+        for attribute in dir(self):
+            if attribute.startswith("_"):
+                continue
+            value = getattr(self, attribute)
+            if not isinstance(value, types.MethodType):
+                kwargs[attribute] = value
         # Check overwrite
         if overwrite is None:
             overwrite = io_tools.overwrite(filename)
         # Save, if all went well!
         if overwrite:
-            np.savez(filename, **kwargs)
+            if compress:
+                np.savez_compressed(filename, **kwargs)
+            else:
+                np.savez(filename, **kwargs)
             _logger.info(f"Saved results to {filename}")
 
     def load(self, filename):
@@ -2682,51 +3167,25 @@ def load(self, filename):
         """
         decomposition = np.load(filename, allow_pickle=True)
 
+        values = {}
         for key, value in decomposition.items():
             if value.dtype == np.dtype("object"):
                 value = None
             # Unwrap values stored as 0D numpy arrays to raw datatypes
             if isinstance(value, np.ndarray) and value.ndim == 0:
                 value = value.item()
-            setattr(self, key, value)
-
-        _logger.info(f"Loaded results from {filename}")
+            values[key] = value
 
         # For compatibility with old version
-        if hasattr(self, "algorithm"):
-            self.decomposition_algorithm = self.algorithm
-            del self.algorithm
-        if hasattr(self, "V"):
-            self.explained_variance = self.V
-            del self.V
-        if hasattr(self, "w"):
-            self.unmixing_matrix = self.w
-            del self.w
-        if hasattr(self, "variance2one"):
-            del self.variance2one
-        if hasattr(self, "centered"):
-            del self.centered
-        if hasattr(self, "pca_algorithm"):
-            self.decomposition_algorithm = self.pca_algorithm
-            del self.pca_algorithm
-        if hasattr(self, "ica_algorithm"):
-            self.bss_algorithm = self.ica_algorithm
-            del self.ica_algorithm
-        if hasattr(self, "v"):
-            self.loadings = self.v
-            del self.v
-        if hasattr(self, "scores"):
-            self.loadings = self.scores
-            del self.scores
-        if hasattr(self, "pc"):
-            self.loadings = self.pc
-            del self.pc
-        if hasattr(self, "ica_scores"):
-            self.bss_loadings = self.ica_scores
-            del self.ica_scores
-        if hasattr(self, "ica_factors"):
-            self.bss_factors = self.ica_factors
-            del self.ica_factors
+        for old_key, key in _learning_results_legacy_keys.items():
+            if old_key in values:
+                value = values.pop(old_key)
+                if key is not None:
+                    values[key] = value
+
+        self.__dict__.update(values)
+
+        _logger.info(f"Loaded results from {filename}")
 
         # Log summary
         self.summary()
@@ -2799,3 +3258,16 @@ def _transpose_results(self):
             self.bss_factors,
         )
 
+    def _get_cumulative_explained_variance_ratio(self):
+        """Return the cumulative explained variance ratio.
+
+        It is only computed again when the explained variance is replaced,
+        e.g. by a new decomposition.
+        """
+        cache = self._cumulative_explained_variance_ratio
+        if cache is None or cache[0] is not self.explained_variance:
+            explained_variance = self.explained_variance
+            cumu = np.cumsum(explained_variance) / np.sum(explained_variance)
+            self._cumulative_explained_variance_ratio = (explained_variance, cumu)
+        return self._cumulative_explained_variance_ratio[1]
+
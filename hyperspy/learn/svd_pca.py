@@ -94,8 +94,9 @@ def svd_solve(
             `output_dimension`: if the input data is larger than 500x500 and the
             number of components to extract is lower than 80% of the smallest
             dimension of the data, then the more efficient "randomized"
-            method is enabled. Otherwise the exact full SVD is computed and
-            optionally truncated afterwards.
+            method is enabled, using two power iterations if fewer than half of
+            the components are extracted. Otherwise the exact full SVD is
+            computed and optionally truncated afterwards.
         If full:
             run exact SVD, calling the standard LAPACK solver via
             :py:func:`scipy.linalg.svd`, and select the components by postprocessing
@@ -141,6 +142,10 @@ def svd_solve(
             and sklearn_installed
         ):
             svd_solver = "randomized"
+            if output_dimension < 0.5 * min(m, n):
+                # A few power iterations are sufficient to resolve
+                # the leading components of strongly truncated problems
+                kwargs.setdefault("n_iter", 2)
         else:
             svd_solver = "full"
 
@@ -206,8 +211,9 @@ def svd_pca(
             `output_dimension`: if the input data is larger than 500x500 and the
             number of components to extract is lower than 80% of the smallest
             dimension of the data, then the more efficient "randomized"
-            method is enabled. Otherwise the exact full SVD is computed and
-            optionally truncated afterwards.
+            method is enabled, using two power iterations if fewer than half of
+            the components are extracted. Otherwise the exact full SVD is
+            computed and optionally truncated afterwards.
         If full:
             run exact SVD, calling the standard LAPACK solver via
             :py:func:`scipy.linalg.svd`, and select the components by postprocessing
@@ -285,8 +291,6 @@ def svd_pca(
         **kwargs,
     )
 
-    explained_variance = S ** 2 / N
-
     if auto_transpose is False:
         factors = V.T
         loadings = U * S
@@ -294,4 +298,7 @@ def svd_pca(
         loadings = V.T
         factors = U * S
 
+    explained_variance = S ** 2
+    explained_variance /= N
+
     return factors, loadings, explained_variance, mean
@@ -69,8 +69,16 @@ def whiten_data(X, centre=True, method="PCA", epsilon=1e-10):
         Y -= Y.mean(axis=0)
 
     # Calculate the whitening matrix
-    R = (Y.T @ Y) / Y.shape[0]
-    U, S, _ = svd_solve(R, svd_solver="full")
+    n_samples, n_features = Y.shape
+    if n_samples >= n_features:
+        # Get the eigendecomposition of the covariance matrix from the
+        # SVD of the data, which avoids squaring its condition number
+        _, S, V = svd_solve(Y, svd_solver="full", u_based_decision=False)
+        U = V.T
+        S = S ** 2 / n_samples
+    else:
+        R = (Y.T @ Y) / n_samples
+        U, S, _ = svd_solve(R, svd_solver="full")
     S = np.sqrt(S + epsilon)[:, np.newaxis]
 
     if method == "PCA":
@@ -434,6 +434,190 @@ def _numba_histogram(data, bins, ranges):
     return hist
 
 
+def numba_nanminmax(data):
+    """Minimum and maximum of each column of a 2D array, ignoring NaNs.
+
+    Both are computed in a single pass over the data, in memory order.
+
+    Parameters
+    ----------
+    data : numpy array
+        2D array of real floating-point values.
+
+    Returns
+    -------
+    minimum, maximum : numpy array
+        The minimum and maximum of each column. Columns containing only
+        NaNs have a minimum of +inf and a maximum of -inf.
+    """
+    # Make sure that native endian is used
+    if not data.dtype.isnative:
+        data = data.astype(data.dtype.type)
+    if data.flags.f_contiguous and not data.flags.c_contiguous:
+        return _numba_nanminmax(data.T, 1)
+    return _numba_nanminmax(data, 0)
+
+
+@njit(cache=True)
+def _numba_nanminmax(data, axis):  # pragma: no cover
+    """
+    Numba minimum and maximum along the given axis, requiring native
+    endian datatype.
+    """
+    size = data.shape[1 - axis]
+    minimum = np.full(size, np.inf)
+    maximum = np.full(size, -np.inf)
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            k = j if axis == 0 else i
+            value = data[i, j]
+            # Comparisons with NaN are always False
+            if value < minimum[k]:
+                minimum[k] = value
+            if value > maximum[k]:
+                maximum[k] = value
+    return minimum, maximum
+
+
+def numba_row_column_sums(data):
+    """Sums of the rows and of the columns and minimum of a 2D array.
+
+    All are computed in a single pass over the data, in memory order.
+
+    Parameters
+    ----------
+    data : numpy array
+        2D array of real floating-point values, in native byte order.
+
+    Returns
+    -------
+    row_sums, column_sums : numpy array
+        The sums of each row and of each column, in double precision.
+    minimum : float
+        The minimum of the array, ignoring NaNs.
+    """
+    if data.flags.f_contiguous and not data.flags.c_contiguous:
+        column_sums, row_sums, minimum = _numba_row_column_sums(data.T)
+        return row_sums, column_sums, minimum
+    return _numba_row_column_sums(data)
+
+
+@njit(cache=True)
+def _numba_row_column_sums(data):  # pragma: no cover
+    """
+    Numba sums of the rows and columns and minimum, requiring native
+    endian datatype.
+    """
+    row_sums = np.zeros(data.shape[0])
+    column_sums = np.zeros(data.shape[1])
+    minimum = np.inf
+    for i in range(data.shape[0]):
+        row_sum = 0.0
+        for j in range(data.shape[1]):
+            value = data[i, j]
+            row_sum += value
+            column_sums[j] += value
+            # Comparisons with NaN are always False
+            if value < minimum:
+                minimum = value
+        row_sums[i] = row_sum
+    return row_sums, column_sums, minimum
+
+
+def numba_divide_rows_columns(data, row_scales, column_scales):
+    """Divide in place each element of a 2D array by the product of the
+    scales of its row and column.
+
+    The elements whose scale product is zero or NaN are set to zero.
+
+    Parameters
+    ----------
+    data : numpy array
+        2D array of real floating-point values, in native byte order.
+    row_scales, column_scales : numpy array
+        1D arrays of the scales of the rows and of the columns.
+    """
+    if data.flags.f_contiguous and not data.flags.c_contiguous:
+        _numba_divide_rows_columns(data.T, column_scales, row_scales)
+    else:
+        _numba_divide_rows_columns(data, row_scales, column_scales)
+
+
+@njit(cache=True)
+def _numba_divide_rows_columns(data, row_scales, column_scales):  # pragma: no cover
+    """
+    Numba division by the row and column scales, requiring native
+    endian datatype.
+    """
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            scale = row_scales[i] * column_scales[j]
+            if scale > 0 or scale < 0:
+                data[i, j] /= scale
+            else:
+                data[i, j] = 0.0
+
+
+def numba_within_cluster_sums(data, labels, n_clusters):
+    """Sum of the squared distances of the samples to their cluster mean.
+
+    The cluster means and the squared distances are computed in two passes
+    over the data, without temporary arrays.
+
+    Parameters
+    ----------
+    data : numpy array
+        2D array of real floating-point values of shape
+        (n_samples, n_features).
+    labels : numpy array
+        1D integer array of the cluster of each sample. Samples with a
+        negative label are ignored.
+    n_clusters : int
+        Number of clusters.
+
+    Returns
+    -------
+    numpy array
+        The sum of the squared distances of each cluster, zero for
+        empty clusters.
+    """
+    # Make sure that native endian is used
+    if not data.dtype.isnative:
+        data = data.astype(data.dtype.type)
+    return _numba_within_cluster_sums(data, labels, n_clusters)
+
+
+@njit(cache=True)
+def _numba_within_cluster_sums(data, labels, n_clusters):  # pragma: no cover
+    """
+    Numba sum of the squared distances to the cluster means, requiring
+    native endian datatype.
+    """
+    n_features = data.shape[1]
+    counts = np.zeros(n_clusters)
+    means = np.zeros((n_clusters, n_features))
+    for i in range(data.shape[0]):
+        c = labels[i]
+        if c < 0:
+            continue
+        counts[c] += 1
+        for j in range(n_features):
+            means[c, j] += data[i, j]
+    for c in range(n_clusters):
+        if counts[c] > 0:
+            for j in range(n_features):
+                means[c, j] /= counts[c]
+    sums = np.zeros(n_clusters)
+    for i in range(data.shape[0]):
+        c = labels[i]
+        if c < 0:
+            continue
+        for j in range(n_features):
+            diff = data[i, j] - means[c, j]
+            sums[c] += diff * diff
+    return sums
+
+
 def get_signal_chunk_slice(index, chunks):
     """
     Convenience function returning the chunk slice in signal space containing
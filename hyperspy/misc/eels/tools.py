@@ -19,6 +19,7 @@
 import math
 import numbers
 import logging
+from functools import lru_cache
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -328,6 +329,52 @@ def eels_constant(s, zlp, t):
     k.metadata.General.title = "EELS proportionality constant K"
     return k
 
+@lru_cache(maxsize=None)
+def _get_edges_table():
+    """Return the edges of the elements database as arrays sorted by
+    onset energy.
+
+    The table is built on first use and cached, call
+    ``_get_edges_table.cache_clear()`` after modifying the elements
+    database to take the changes into account.
+
+    Returns
+    -------
+    edges : numpy array of str
+        The edges, in the format 'element_subshell'.
+    onset_energies : numpy array of float
+        The onset energies of the edges, in eV, in ascending order.
+    major : numpy array of bool
+        Whether the edges are major edges.
+    database_index : numpy array of int
+        The position of the edges in the elements database, which orders
+        edges with equal energies.
+    """
+    edges = []
+    onset_energies = []
+    major = []
+    for element, element_info in elements_db.items():
+        try:
+            binding_energies = \
+                element_info['Atomic_properties']['Binding_energies']
+        except KeyError:
+            continue
+        for shell, shell_info in binding_energies.items():
+            if shell[-1] != 'a':
+                edges.append('{}_{}'.format(element, shell))
+                onset_energies.append(shell_info['onset_energy (eV)'])
+                major.append(shell_info['relevance'] == 'Major')
+    onset_energies = np.array(onset_energies, dtype=float)
+    database_index = np.argsort(onset_energies, kind='stable')
+    table = (np.array(edges)[database_index],
+             onset_energies[database_index],
+             np.array(major, dtype=bool)[database_index],
+             database_index)
+    # The cached arrays are shared by all the calls
+    for array in table:
+        array.setflags(write=False)
+    return table
+
 def get_edges_near_energy(energy, width=10, only_major=False, order='closest'):
     """Find edges near a given energy that are within the given energy
     window.
@@ -351,6 +398,11 @@ def get_edges_near_energy(energy, width=10, only_major=False, order='closest'):
     edges : list
         All edges that are within the given energy window, sorted by
         energy difference to the given energy.
+
+    Notes
+    -----
+    The edges of the elements database are cached on first use; call
+    ``_get_edges_table.cache_clear()`` after modifying the database.
     """
 
     if width < 0:
@@ -362,34 +414,26 @@ def get_edges_near_energy(energy, width=10, only_major=False, order='closest'):
     Emin, Emax = energy - width/2, energy + width/2
 
     # find all subshells that have its energy within range
-    valid_edges = []
-    for element, element_info in elements_db.items():
-        try:
-            for shell, shell_info in element_info[
-                'Atomic_properties']['Binding_energies'].items():
-                if only_major:
-                    if shell_info['relevance'] != 'Major':
-                        continue
-                if shell[-1] != 'a' and \
-                    Emin <= shell_info['onset_energy (eV)'] <= Emax:
-                    subshell = '{}_{}'.format(element, shell)
-                    Ediff = np.abs(shell_info['onset_energy (eV)'] - energy)
-                    valid_edges.append((subshell,
-                                        shell_info['onset_energy (eV)'],
-                                        Ediff))
-        except KeyError:
-            continue
-
-    # Sort according to 'order' and return only the edges
+    edges, onset_energies, major, database_index = _get_edges_table()
+    start = np.searchsorted(onset_energies, Emin, side='left')
+    stop = np.searchsorted(onset_energies, Emax, side='right')
+    edges = edges[start:stop]
+    onset_energies = onset_energies[start:stop]
+    database_index = database_index[start:stop]
+    if only_major:
+        valid = major[start:stop]
+        edges = edges[valid]
+        onset_energies = onset_energies[valid]
+        database_index = database_index[valid]
+
+    # Sort according to 'order', keeping the database order of equal values
     if order == 'closest':
-        edges = [edge for edge, _, _ in sorted(valid_edges, key=lambda x: x[2])]
-    elif order == 'ascending':
-        edges = [edge for edge, _, _ in sorted(valid_edges, key=lambda x: x[1])]
+        edges = edges[np.lexsort((database_index,
+                                  np.abs(onset_energies - energy)))]
     elif order == 'descending':
-        edges = [edge for edge, _, _ in sorted(valid_edges, key=lambda x: x[1],
-                                               reverse=True)]
+        edges = edges[np.lexsort((database_index, -onset_energies))]
 
-    return edges
+    return edges.tolist()
 
 def get_info_from_edges(edges):
     """Return the information of a sequence of edges as a list of dictionaries
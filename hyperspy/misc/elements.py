@@ -4236,8 +4236,8 @@
 # read dictionary of atomic numbers from HyperSpy, and add the elements that
 # do not currently exist in the database (in case anyone is doing EDS on
 # Ununpentium...)
-atomic_number2name = dict((p.General_properties.Z, e)
-                          for (e, p) in elements_db)
+atomic_number2name = dict((p['General_properties']['Z'], e)
+                          for (e, p) in elements.items())
 atomic_number2name.update({93: 'Np', 94: 'Pu', 95: 'Am', 96: 'Cm', 97: 'Bk',
                            98: 'Cf', 99: 'Es', 100: 'Fm', 101: 'Md', 102: 'No',
                            103: 'Lr', 104: 'Rf', 105: 'Db', 106: 'Sg',
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import dask.array as da
 import numpy as np
 import pytest
 from distutils.version import LooseVersion
@@ -24,6 +25,7 @@
 from hyperspy._signals.signal2d import Signal2D
 from hyperspy.datasets import artificial_data
 from hyperspy.decorators import lazifyTestClass
+from hyperspy.learn.mva import _get_derivative, _solve_unmixing
 from hyperspy.misc.machine_learning.import_sklearn import sklearn_installed
 from hyperspy.misc.machine_learning.tools import amari
 from hyperspy.signals import BaseSignal
@@ -70,6 +72,44 @@ def test_amari_distance(n=16, tol=1e-6):
     np.testing.assert_allclose(amari(X, A), 0.0, rtol=tol)
 
 
+@pytest.mark.parametrize("lazy", [False, True])
+def test_solve_unmixing(lazy):
+    rng = np.random.RandomState(123)
+    a = rng.randn(50, 4)
+    w = rng.randn(4, 4)
+    a_ = da.from_array(a, chunks=(10, 2)) if lazy else a
+    x = _solve_unmixing(a_, w)
+    if lazy:
+        x = x.compute()
+    np.testing.assert_allclose(x, a @ np.linalg.inv(w))
+
+
+def test_solve_unmixing_singular():
+    rng = np.random.RandomState(123)
+    a = rng.randn(50, 4)
+    w = rng.randn(4, 4)
+    w[3] = w[2]
+    with pytest.warns(UserWarning, match="Cannot invert unmixing matrix"):
+        x = _solve_unmixing(a, w)
+    np.testing.assert_allclose(x, a @ np.linalg.pinv(w), atol=1e-8)
+
+
+@pytest.mark.parametrize("diff_axes", [None, [0], [1, 0]])
+@pytest.mark.parametrize("diff_order", [1, 2])
+def test_mask_derivative(diff_axes, diff_order):
+    rng = np.random.RandomState(123)
+    mask = Signal2D(rng.rand(6, 7) < 0.15)
+    mask.axes_manager[0].scale = 0.1
+    # The mask of the derivative is where the NaNs propagate
+    nan_mask = mask.deepcopy()
+    nan_mask.change_dtype("float")
+    nan_mask.data[nan_mask.data == 1] = np.nan
+    expected = _get_derivative(nan_mask, diff_axes, diff_order)
+    result = _get_derivative(mask, diff_axes, diff_order, is_mask=True)
+    assert result.data.dtype == bool
+    np.testing.assert_array_equal(result.data, np.isnan(expected.data))
+
+
 @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
 def test_bss_FastICA_object():
     """Tests that a simple sklearn pipeline is an acceptable algorithm."""
@@ -128,6 +168,27 @@ def test_orthomax(whiten_method):
     s.blind_source_separation(2, algorithm="orthomax", gamma=2)
 
 
+def test_whitening_cache():
+    rng = np.random.RandomState(123)
+    S = rng.laplace(size=(3, 500))
+    A = rng.random_sample(size=(3, 3))
+    s = Signal1D(A @ S)
+    s.decomposition()
+    s.blind_source_separation(3, algorithm="orthomax")
+    W = s.learning_results.unmixing_matrix.copy()
+    key, invsqcovmat = s.learning_results._whitening_cache
+
+    s.blind_source_separation(3, algorithm="orthomax")
+    assert s.learning_results._whitening_cache[1] is invsqcovmat
+    np.testing.assert_allclose(s.learning_results.unmixing_matrix, W)
+
+    s.blind_source_separation(2, algorithm="orthomax")
+    assert s.learning_results._whitening_cache[0] != key
+
+    s.decomposition()
+    assert s.learning_results._whitening_cache is None
+
+
 def test_no_decomposition_error():
     s = artificial_data.get_core_loss_eels_line_scan_signal()
 
@@ -16,10 +16,13 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import warnings
+
 import numpy as np
 import pytest
 
 from hyperspy import signals
+from hyperspy.learn.mva import _sum_by_cluster
 from hyperspy.misc.machine_learning import import_sklearn
 
 sklearn = pytest.importorskip("sklearn", reason="sklearn not installed")
@@ -229,6 +232,93 @@ def test_metric(self, metric):
         np.testing.assert_allclose(k_range, test_k_range)
         np.testing.assert_allclose(best_k, 3)
 
+    def test_silhouette_precomputed_distances(self):
+        kwargs = dict(
+            max_clusters=4,
+            preprocessing="norm",
+            algorithm="kmeans",
+            metric="silhouette",
+            random_state=0,
+        )
+        self.signal.estimate_number_of_clusters("signal", **kwargs)
+        precomputed = self.signal.learning_results.cluster_metric_data
+        # Compute the distances for every k, as they don't fit in 1 MiB
+        with sklearn.config_context(working_memory=1):
+            self.signal.estimate_number_of_clusters("signal", **kwargs)
+        np.testing.assert_allclose(
+            self.signal.learning_results.cluster_metric_data, precomputed
+        )
+
+    def _record_n_init(self, monkeypatch):
+        n_inits = []
+        cluster_analysis = type(self.signal)._cluster_analysis
+
+        def _cluster_analysis(self, scaled_data, algorithm):
+            n_inits.append(algorithm.n_init)
+            return cluster_analysis(self, scaled_data, algorithm)
+
+        monkeypatch.setattr(
+            type(self.signal), "_cluster_analysis", _cluster_analysis
+        )
+        return n_inits
+
+    def test_n_init_elbow(self, monkeypatch):
+        n_inits = self._record_n_init(monkeypatch)
+        self.signal.estimate_number_of_clusters(
+            "signal",
+            max_clusters=4,
+            preprocessing="norm",
+            algorithm="kmeans",
+            metric="elbow",
+            n_init=3,
+        )
+        # A requested n_init isn't overridden by the warm start
+        assert n_inits == [3] * 4
+
+    def test_n_init_gap(self, monkeypatch):
+        n_inits = self._record_n_init(monkeypatch)
+        self.signal.estimate_number_of_clusters(
+            "signal",
+            max_clusters=3,
+            preprocessing="norm",
+            algorithm="kmeans",
+            metric="gap",
+            n_ref=2,
+            n_init=3,
+        )
+        # The data is clustered with the requested n_init for every k,
+        # the references with a single initialization
+        assert n_inits == [3, 1, 1] * 3
+
+    @pytest.mark.parametrize("metric", ("elbow", "gap"))
+    def test_warm_start(self, metric):
+        kwargs = dict(
+            max_clusters=5,
+            preprocessing="norm",
+            algorithm="kmeans",
+            metric=metric,
+            random_state=0,
+        )
+        # The baseline fits every k from the k-means++ initialization
+        self.signal.estimate_number_of_clusters(
+            "signal", init="k-means++", **kwargs
+        )
+        lr = self.signal.learning_results
+        baseline = lr.cluster_metric_data
+        assert lr.estimated_number_of_clusters == 3
+
+        # which is the default, the warm start being opt-in
+        self.signal.estimate_number_of_clusters("signal", **kwargs)
+        assert lr.estimated_number_of_clusters == 3
+        np.testing.assert_allclose(lr.cluster_metric_data, baseline)
+
+        # The warm start finds the same clusters up to the best k
+        self.signal.estimate_number_of_clusters(
+            "signal", warm_start=True, **kwargs
+        )
+        assert lr.estimated_number_of_clusters == 3
+        np.testing.assert_allclose(lr.cluster_metric_data[:3], baseline[:3])
+
     @pytest.mark.parametrize("algorithm", ("kmeans", "agglomerative"))
     def test_cluster_algorithm(self, algorithm):
         max_clusters = 6
@@ -454,3 +544,66 @@ def test_get_methods():
 
     cl = signal.get_cluster_distances()
     np.testing.assert_array_equal(cl.data, signal.learning_results.cluster_distances)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "uint16"])
+def test_sum_by_cluster(dtype):
+    rng = np.random.RandomState(123)
+    data = rng.randint(0, 1000, size=(20, 6)).astype(dtype)
+    labels = rng.randint(0, 3, size=20)
+    cluster_labels = labels == np.arange(3)[:, np.newaxis]
+    expected = np.stack([data[cl].sum(0) for cl in cluster_labels])
+    sums = _sum_by_cluster(cluster_labels, data)
+    assert sums.dtype == expected.dtype
+    np.testing.assert_allclose(sums, expected)
+
+    # Non-finite values only affect their own cluster
+    if dtype == "float64":
+        data[labels == 0] = np.nan
+        sums = _sum_by_cluster(cluster_labels, data)
+        assert np.all(np.isnan(sums[0]))
+        np.testing.assert_allclose(sums[1:], expected[1:])
+
+
+@pytest.mark.parametrize("squared", [True, False])
+@pytest.mark.parametrize("summed", [True, False])
+def test_distances_within_cluster(summed, squared):
+    from sklearn.metrics.pairwise import euclidean_distances
+
+    rng = np.random.RandomState(123)
+    data = rng.randn(50, 4)
+    labels = rng.randint(0, 3, size=50)
+    # Unclustered samples are ignored
+    labels[:2] = -1
+    expected = [
+        euclidean_distances(data[labels == c], squared=squared).mean(0) / 2.0
+        for c in range(3)
+    ]
+    if summed:
+        expected = [np.sum(x) for x in expected]
+    result = signal1._distances_within_cluster(
+        data, labels, squared=squared, summed=summed
+    )
+    assert len(result) == 3
+    if squared and not summed:
+        # Empty clusters don't emit warnings and have no distances
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            result4 = signal1._distances_within_cluster(
+                data, labels, n_clusters=4
+            )
+        assert len(result4) == 4
+        assert result4[-1].size == 0
+    if summed and squared:
+        assert isinstance(result, np.ndarray)
+        # Empty clusters have no distances
+        result4 = signal1._distances_within_cluster(
+            data, labels, summed=True, n_clusters=4
+        )
+        np.testing.assert_allclose(result4, np.append(result, 0.0))
+        result4 = signal1._distances_within_cluster(
+            data.astype(int), labels, summed=True, n_clusters=4
+        )
+        assert result4[-1] == 0.0
+    for r, e in zip(result, expected):
+        np.testing.assert_allclose(r, e)
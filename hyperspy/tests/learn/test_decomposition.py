@@ -25,6 +25,8 @@
 from hyperspy import signals
 from hyperspy.decorators import lazifyTestClass
 from hyperspy.exceptions import VisibleDeprecationWarning
+from hyperspy.learn.mva import LearningResults, _matmul_by_blocks
+from hyperspy.learn.svd_pca import svd_pca
 from hyperspy.misc.machine_learning.import_sklearn import sklearn_installed
 
 
@@ -144,6 +146,15 @@ def test_get_decomposition_model(self, centre):
         rms = np.sqrt(((sc.data - s.data) ** 2).sum())
         assert rms < 5e-7
 
+    def test_get_decomposition_model_components_list(self):
+        s = self.s
+        s.decomposition(algorithm="SVD")
+        sc = s.get_decomposition_model([0, 2])
+        factors = s.learning_results.factors
+        loadings = s.learning_results.loadings
+        a = factors[:, [0, 2]] @ loadings[:, [0, 2]].T
+        np.testing.assert_allclose(sc.data, a.T.reshape(s.data.shape))
+
     @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
     def test_get_bss_model(self):
         s = self.s
@@ -153,6 +164,22 @@ def test_get_bss_model(self):
         rms = np.sqrt(((sc.data - s.data) ** 2).sum())
         assert rms < 5e-7
 
+    @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
+    def test_get_bss_model_decomposition_unchanged(self):
+        s = self.s
+        s.decomposition(algorithm="SVD")
+        s.blind_source_separation(3)
+        lr = s.learning_results
+        # In-memory BSS results are converted to dask for lazy signals
+        lr.bss_factors = np.array(lr.bss_factors)
+        lr.bss_loadings = np.array(lr.bss_loadings)
+        factors = np.array(lr.factors)
+        loadings = np.array(lr.loadings)
+        sc = s.get_bss_model()
+        assert sc._lazy == s._lazy
+        np.testing.assert_array_equal(s.learning_results.factors, factors)
+        np.testing.assert_array_equal(s.learning_results.loadings, loadings)
+
 
 @lazifyTestClass
 class TestGetExplainedVarinaceRatio:
@@ -463,6 +490,19 @@ def test_load_decomposition_results(self):
             self.s.save(fname2)
             assert isinstance(self.s.learning_results.decomposition_algorithm, str)
 
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_save_load_compress(self, compress):
+        with TemporaryDirectory() as tmpdir:
+            self.s.decomposition()
+            lr = self.s.learning_results
+            fname = Path(tmpdir, "results.npz")
+            lr.save(fname, overwrite=True, compress=compress)
+            lr2 = LearningResults()
+            lr2.load(fname)
+            np.testing.assert_allclose(lr2.factors, lr.factors)
+            np.testing.assert_allclose(lr2.loadings, lr.loadings)
+            assert lr2.decomposition_algorithm == lr.decomposition_algorithm
+
 
 class TestComplexSignalDecomposition:
     def setup_method(self, method):
@@ -509,6 +549,43 @@ def test_decomposition_reproject(reproject):
     s.decomposition(reproject=reproject)
 
 
+@pytest.mark.parametrize("output_dimension", [None, 5])
+def test_decomposition_reproject_signal(output_dimension):
+    x = generate_low_rank_matrix()
+    s = signals.Signal1D(x)
+    s.decomposition(output_dimension=output_dimension, reproject="signal")
+    loadings = s.learning_results.loadings
+    np.testing.assert_allclose(
+        s.learning_results.factors, (np.linalg.pinv(loadings) @ x).T, atol=1e-10
+    )
+
+
+@pytest.mark.parametrize("centre", [None, "signal"])
+def test_decomposition_single_precision(centre):
+    s = signals.Signal1D(generate_low_rank_matrix())
+    s.decomposition(output_dimension=5, centre=centre)
+    factors = s.learning_results.factors.copy()
+    explained_variance = s.learning_results.explained_variance.copy()
+
+    s.decomposition(output_dimension=5, centre=centre, precision="single")
+    assert s.learning_results.factors.dtype == s.data.dtype
+    assert s.learning_results.loadings.dtype == s.data.dtype
+    np.testing.assert_allclose(
+        s.learning_results.explained_variance, explained_variance, rtol=1e-4
+    )
+    np.testing.assert_allclose(
+        np.abs(s.learning_results.factors), np.abs(factors), atol=1e-4
+    )
+
+
+def test_decomposition_precision_error():
+    s = signals.Signal1D(generate_low_rank_matrix())
+    with pytest.raises(ValueError, match="`precision` must be one of"):
+        s.decomposition(precision="half")
+    with pytest.raises(ValueError, match="only supported by the 'SVD'"):
+        s.decomposition(algorithm="ORPCA", output_dimension=3, precision="single")
+
+
 @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
 @pytest.mark.parametrize("reproject", ["signal", "both"])
 def test_decomposition_reproject_warning(reproject):
@@ -608,6 +685,30 @@ def test_undo_treatments_error():
         s.undo_treatments()
 
 
+@pytest.mark.parametrize("normalize_poissonian_noise", [True, False])
+def test_decomposition_copy(normalize_poissonian_noise):
+    x = generate_low_rank_matrix()
+    s = signals.Signal1D(x.copy())
+    s.decomposition(normalize_poissonian_noise, output_dimension=2)
+    np.testing.assert_array_equal(s.data, x)
+    assert not hasattr(s, "_data_before_treatments")
+
+
+@pytest.mark.parametrize("copy", [True, "disk"])
+def test_decomposition_copy_undo_treatments(copy):
+    x = generate_low_rank_matrix()
+    s = signals.Signal1D(x.copy())
+    s.decomposition(True, output_dimension=2, copy=copy)
+    np.testing.assert_array_equal(s.data, x)
+    assert not hasattr(s, "_data_before_treatments")
+
+
+def test_decomposition_copy_error():
+    s = signals.Signal1D(generate_low_rank_matrix())
+    with pytest.raises(ValueError, match="`copy` must be one of"):
+        s.decomposition(True, copy="Disk")
+
+
 def test_normalize_components_errors():
     s = signals.Signal1D(generate_low_rank_matrix())
 
@@ -668,6 +769,42 @@ def test_decomposition_signal_mask(mask_as_array):
     assert not np.isnan(s.get_decomposition_loadings().data).any()
 
 
+def test_decomposition_navigation_and_signal_mask():
+    x = generate_low_rank_matrix()
+    s = signals.Signal1D(x)
+    navigation_mask = s.sum(-1).data < 1.5
+    signal_mask = s.sum(0).data < 0.25
+    s.decomposition(navigation_mask=navigation_mask, signal_mask=signal_mask)
+    factors, loadings, _, _ = svd_pca(x[~navigation_mask][:, ~signal_mask])
+    np.testing.assert_allclose(
+        s.learning_results.factors[~signal_mask], factors, atol=1e-10
+    )
+    np.testing.assert_allclose(
+        s.learning_results.loadings[~navigation_mask], loadings, atol=1e-10
+    )
+    assert np.isnan(s.learning_results.factors[signal_mask]).all()
+    assert np.isnan(s.learning_results.loadings[navigation_mask]).all()
+
+
+def test_decomposition_masks_transposed():
+    s = signals.Signal1D(generate_low_rank_matrix())
+    navigation_mask = s.sum(-1).data < 1.5
+    signal_mask = s.sum(0).data < 0.25
+    s.decomposition(navigation_mask=navigation_mask, signal_mask=signal_mask)
+    # Same data array, but with the navigation axis last
+    sT = signals.BaseSignal(s.data)
+    sT.axes_manager._axes[0].navigate = False
+    sT.axes_manager._axes[1].navigate = True
+    assert sT.axes_manager[0].index_in_array == 1
+    sT.decomposition(navigation_mask=signal_mask, signal_mask=navigation_mask)
+    np.testing.assert_allclose(
+        s.learning_results.factors, sT.learning_results.loadings, atol=1e-10
+    )
+    np.testing.assert_allclose(
+        s.learning_results.loadings, sT.learning_results.factors, atol=1e-10
+    )
+
+
 @pytest.mark.parametrize('normalise_poissonian_noise', [True, False])
 def test_decomposition_mask_all_data(normalise_poissonian_noise):
     with pytest.raises(ValueError, match='All the data are masked'):
@@ -680,3 +817,40 @@ def test_decomposition_mask_all_data(normalise_poissonian_noise):
         navigation_mask = (s.sum(-1) >= 0)
         s.decomposition(normalise_poissonian_noise,
                         navigation_mask=navigation_mask)
+
+
+@pytest.mark.parametrize("mask_navigation", [True, False])
+@pytest.mark.parametrize("mask_signal", [True, False])
+def test_normalize_poissonian_noise_masks(mask_navigation, mask_signal):
+    rng = np.random.RandomState(123)
+    data = rng.poisson(10, size=(6, 5, 8)).astype(float)
+    s = signals.Signal1D(data.copy())
+    navigation_mask = np.zeros((6, 5), dtype=bool)
+    signal_mask = np.zeros(8, dtype=bool)
+    if mask_navigation:
+        navigation_mask[0] = True
+    if mask_signal:
+        signal_mask[:2] = True
+    s.normalize_poissonian_noise(
+        navigation_mask=navigation_mask if mask_navigation else None,
+        signal_mask=signal_mask if mask_signal else None,
+    )
+
+    unmasked = np.ix_(~navigation_mask.ravel(), ~signal_mask)
+    dc = data.reshape(30, 8)[unmasked]
+    expected = dc / np.sqrt(dc.sum(1, keepdims=True) * dc.sum(0, keepdims=True))
+    result = s.data.reshape(30, 8)
+    np.testing.assert_allclose(result[unmasked], expected)
+    # The masked data is left untouched
+    masked = navigation_mask.ravel()[:, np.newaxis] | signal_mask
+    np.testing.assert_array_equal(result[masked], data.reshape(30, 8)[masked])
+
+
+def test_matmul_by_blocks():
+    rng = np.random.RandomState(123)
+    # The product is computed in several blocks of rows
+    a = rng.randn(300, 3)
+    b = rng.randn(3, 1000)
+    np.testing.assert_allclose(_matmul_by_blocks(a, b), a @ b)
+    c = rng.randn(300, 1)
+    np.testing.assert_allclose(_matmul_by_blocks(a, b, c), a @ b + c)
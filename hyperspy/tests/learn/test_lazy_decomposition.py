@@ -76,6 +76,25 @@ def test_svd(self, output_dimension, normalize_poissonian_noise):
             explained_variance_norm[: self.rank].sum(), 1.0, atol=1e-6
         )
 
+    def test_svd_compressed(self):
+        self.s.decomposition(output_dimension=3, svd_solver="full")
+        lr = self.s.learning_results
+        factors = np.asarray(lr.factors)
+        explained_variance = np.asarray(lr.explained_variance)
+
+        # The randomized SVD is seeded, so that the results repeat
+        self.s.decomposition(output_dimension=3)
+        np.testing.assert_allclose(np.asarray(lr.factors), factors)
+        np.testing.assert_allclose(
+            np.asarray(lr.explained_variance), explained_variance
+        )
+
+        # and match the exact SVD, up to a small fraction of the variance
+        S = np.linalg.svd(self.X, compute_uv=False)[:3]
+        np.testing.assert_allclose(
+            explained_variance, S ** 2 / self.m, atol=1e-6 * np.sum(S ** 2)
+        )
+
     @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
     @pytest.mark.parametrize("normalize_poissonian_noise", [True, False])
     def test_pca(self, normalize_poissonian_noise):
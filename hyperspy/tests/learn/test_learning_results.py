@@ -20,6 +20,7 @@
 import numpy as np
 import pytest
 
+from hyperspy.learn.mva import LearningResults
 from hyperspy.misc.machine_learning.import_sklearn import sklearn_installed
 from hyperspy.signals import Signal1D
 
@@ -50,3 +51,35 @@ def test_learning_results_bss():
     assert "Demixing parameters" in out
     assert "algorithm=sklearn_fastica" in out
     assert "n_components=2" in out
+
+
+def test_cumulative_explained_variance_ratio():
+    rng = np.random.RandomState(123)
+
+    s1 = Signal1D(rng.random_sample(size=(20, 100)))
+    s1.decomposition()
+    lr = s1.learning_results
+    ev = lr.explained_variance
+    cumu = lr._get_cumulative_explained_variance_ratio()
+    np.testing.assert_allclose(cumu, np.cumsum(ev) / np.sum(ev))
+    assert lr._get_cumulative_explained_variance_ratio() is cumu
+
+    # A new decomposition invalidates the cache
+    s1.decomposition(output_dimension=2)
+    cumu = lr._get_cumulative_explained_variance_ratio()
+    assert cumu.shape == (2,)
+    np.testing.assert_allclose(cumu[-1], 1.0)
+
+
+def test_load_legacy_keys(tmp_path):
+    fname = tmp_path / "results.npz"
+    loadings = np.arange(6.0).reshape(3, 2)
+    np.savez(fname, algorithm="SVD", scores=loadings, variance2one=True)
+
+    lr = LearningResults()
+    lr.load(fname)
+    assert lr.decomposition_algorithm == "SVD"
+    np.testing.assert_allclose(lr.loadings, loadings)
+    assert not hasattr(lr, "algorithm")
+    assert not hasattr(lr, "scores")
+    assert not hasattr(lr, "variance2one")
@@ -46,3 +46,14 @@ def test_whiten_error():
 
     with pytest.raises(ValueError, match="method must be one of"):
         Y, W = whiten_data(X, method="uniform")
+
+
+def test_whiten_nan_error():
+    rng = np.random.RandomState(123)
+    m, n = 500, 4
+
+    X = rng.randn(m, n)
+    X[0, 0] = np.nan
+
+    with pytest.raises(ValueError, match="must not contain infs or NaNs"):
+        Y, W = whiten_data(X, centre=False)
@@ -26,6 +26,10 @@
     get_array_memory_size_in_GiB,
     get_signal_chunk_slice,
     numba_histogram,
+    numba_divide_rows_columns,
+    numba_nanminmax,
+    numba_row_column_sums,
+    numba_within_cluster_sums,
     round_half_towards_zero,
     round_half_away_from_zero,
 )
@@ -197,6 +201,54 @@ def test_numba_histogram(dtype):
     np.testing.assert_array_equal(numba_histogram(arr, 5, (0, 100)), [20, 20, 20, 20, 20])
 
 
+@pytest.mark.parametrize('dtype', ['<f8', '>f4'])
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_numba_nanminmax(dtype, order):
+    rng = np.random.RandomState(123)
+    arr = np.asarray(rng.randn(20, 3), dtype=dtype, order=order)
+    arr[[2, 5], 1] = np.nan
+    minimum, maximum = numba_nanminmax(arr)
+    np.testing.assert_allclose(minimum, np.nanmin(arr, axis=0))
+    np.testing.assert_allclose(maximum, np.nanmax(arr, axis=0))
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_numba_row_column_sums(dtype, order):
+    rng = np.random.RandomState(123)
+    arr = np.asarray(rng.randn(20, 3), dtype=dtype, order=order)
+    row_sums, column_sums, minimum = numba_row_column_sums(arr)
+    np.testing.assert_allclose(row_sums, arr.sum(1), rtol=1e-5)
+    np.testing.assert_allclose(column_sums, arr.sum(0), rtol=1e-5)
+    assert minimum == arr.min()
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_numba_divide_rows_columns(order):
+    rng = np.random.RandomState(123)
+    arr = np.asarray(rng.rand(20, 3), order=order)
+    row_scales = rng.rand(20)
+    row_scales[3] = 0.0
+    column_scales = rng.rand(3)
+    column_scales[1] = np.nan
+    expected = arr / (row_scales[:, np.newaxis] * column_scales)
+    expected[~np.isfinite(expected)] = 0.0
+    numba_divide_rows_columns(arr, row_scales, column_scales)
+    np.testing.assert_allclose(arr, expected)
+
+
+def test_numba_within_cluster_sums():
+    rng = np.random.RandomState(123)
+    arr = rng.randn(30, 4)
+    labels = rng.randint(-1, 3, size=30)
+    # The last cluster is empty
+    sums = numba_within_cluster_sums(arr, labels, 4)
+    expected = [
+        ((arr[labels == c] - arr[labels == c].mean(0)) ** 2).sum() for c in range(3)
+    ]
+    np.testing.assert_allclose(sums, expected + [0.0])
+
+
 def test_round_half_towards_zero_integer():
     a = np.array([-2.0, -1.7, -1.5, -0.2, 0.0, 0.2, 1.5, 1.7, 2.0])
     np.testing.assert_allclose(
@@ -17,7 +17,9 @@
 
 import pytest
 
-from hyperspy.misc.eels.tools import get_edges_near_energy, get_info_from_edges
+from hyperspy.misc.eels.tools import (
+    _get_edges_table, get_edges_near_energy, get_info_from_edges)
+from hyperspy.misc.elements import elements as elements_db
 
 
 def test_single_edge():
@@ -62,3 +64,21 @@ def test_info_multiple_edges():
 def test_info_wrong_edge_format():
     with pytest.raises(ValueError):
         get_info_from_edges(['O_K', 'NK'])
+
+
+def test_only_major_edges():
+    edges = get_edges_near_energy(640, width=100, only_major=True)
+    assert edges == ['Mn_L3', 'I_M4', 'Mn_L2', 'I_M5', 'Xe_M5', 'F_K', 'Xe_M4']
+
+
+def test_edges_table_cache_clear(monkeypatch):
+    shell_info = elements_db['O']['Atomic_properties']['Binding_energies']['K']
+    assert get_edges_near_energy(532, width=0) == ['O_K']
+    monkeypatch.setitem(shell_info, 'onset_energy (eV)', 533.0)
+    _get_edges_table.cache_clear()
+    try:
+        assert get_edges_near_energy(532, width=0) == []
+        assert get_edges_near_energy(533, width=0) == ['O_K']
+    finally:
+        monkeypatch.undo()
+        _get_edges_table.cache_clear()